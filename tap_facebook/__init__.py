@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
+import contextvars
+import copy
+import itertools
 import json
 import os
 import os.path
+import queue
 import sys
+import threading
 import time
 
 import datetime
@@ -25,11 +30,17 @@ from singer import (transform,
                     UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING,
                     Transformer, _transform_datetime)
 from singer.catalog import Catalog, CatalogEntry
+from singer.transform import string_to_datetime
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
 from functools import partial
 
 import facebook_business
 from facebook_business import FacebookAdsApi
+from facebook_business.api import Cursor
+import facebook_business.adobjects.adaccount as fb_adaccount
 import facebook_business.adobjects.adcreative as adcreative
 import facebook_business.adobjects.ad as fb_ad
 import facebook_business.adobjects.adset as adset
@@ -44,11 +55,56 @@ from requests.exceptions import ConnectionError, Timeout
 
 API = None
 
+# Ad account synced by the current thread, passed on to the threads it starts
+ACCOUNT_ID = contextvars.ContextVar('account_id', default=None)
+ACCOUNT_PATH_PATTERN = re.compile(r'(?:^|/)act_(\d+)(?:/|$)')
+# Page size of the listing whose first page is being requested by the current thread
+LISTING_PAGE_SIZE = contextvars.ContextVar('listing_page_size', default=None)
+
 INSIGHTS_MAX_WAIT_TO_START_SECONDS = 5 * 60
 INSIGHTS_MAX_WAIT_TO_FINISH_SECONDS = 30 * 60
+INSIGHTS_MIN_ASYNC_SLEEP_SECONDS = 5
 INSIGHTS_MAX_ASYNC_SLEEP_SECONDS = 5 * 60
+# Number of insights jobs kept in the job history, and looked at to judge a job shape
+INSIGHTS_JOB_HISTORY_SIZE = 1000
+INSIGHTS_JOB_HISTORY_WINDOW = 10
 
 RESULT_RETURN_LIMIT = 100
+# Bounds of the page sizes tried by `auto_tune_page_size`, and the seconds under
+# which a page is fast enough for the next one to be twice as large
+MIN_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 5000
+PAGE_SIZE_FAST_SECONDS = 5
+
+# Usage percentage of the Facebook rate limits above which requests are paced,
+# and the longest delay added before a request when the usage nears 100%
+RATE_LIMIT_TARGET_PCT = 75
+RATE_LIMIT_MAX_PACING_SECONDS = 30
+# Error codes of the Facebook rate limits, application, user, page, custom and business use case ones
+THROTTLING_ERROR_CODES = frozenset([4, 17, 32, 613] + list(range(80000, 80015)))
+# Seconds after which the usage last reported for an account, business or the app stops pacing requests
+RATE_LIMIT_USAGE_STALE_SECONDS = 5 * 60
+
+# Maximum number of requests in a single Graph batch request
+BATCH_SIZE = 50
+
+# Number of delivery_info filter slices listed at once when include_deleted is on
+DELIVERY_INFO_FILTER_WORKERS = 5
+# Number of ads read at once when their leads are listed concurrently
+LEADS_ADS_PER_CHUNK = 1000
+# Number of ads without leads synced before the leads state is checkpointed anyway
+LEADS_CHECKPOINT_ADS = 1000
+# Campaign objectives of the ads `leads_lead_gen_ads_only` lists the leads of
+LEAD_GEN_OBJECTIVES = ['LEAD_GENERATION', 'OUTCOME_LEADS']
+# Maximum number of items buffered between background producers and their consumer
+CONCURRENT_QUEUE_SIZE = 1000
+
+# Characters of RECORD messages buffered, and seconds at most, before they are written to stdout
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+OUTPUT_FLUSH_SECONDS = 1
+
+# Number of recently transformed date-time strings kept, insights rows repeat the same dates
+DATETIME_CACHE_SIZE = 4096
 
 REQUEST_TIMEOUT = 300
 DEFAULT_PK_VALUE = "00:00:00 - 00:59:59"
@@ -122,14 +178,188 @@ def retry_on_summary_param_error(backoff_type, exception, **wait_gen_kwargs):
         **wait_gen_kwargs
     )
 
+class RequestGovernor():
+    """
+    Paces the requests made to Facebook from the usage it reports in the
+    x-business-use-case-usage, x-ad-account-usage and x-fb-ads-insights-throttle
+    headers of the responses. The usage is kept per ad account, business and
+    app, a response only updating the usages its headers report, and the
+    requests of an account are only paced on the recent usage of that
+    account, of its businesses and of the app. Once that usage goes over
+    `rate_limit_target_pct` the requests of the account are spaced more and
+    more apart, and once a limit is hit they are held until access is
+    regained, instead of waiting for Facebook to throttle them.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Usage percentage and time it was reported, by (scope, category). The scope is
+        # ('account', id), ('business', id) or ('app', None), the category 'all' or 'insights'
+        self.usages = {}
+        # Time until which the requests of a scope are held
+        self.blocked_until = {}
+        # Ids of the businesses reported on the responses of every account
+        self.businesses = {}
+        # Time of the next request, by (account id, insights request), shared by every thread
+        self.next_request = {}
+
+    def observe(self, headers, account_id=None):
+        if not headers:
+            return
+        usages = {}
+        blocked = {}
+        business_ids = set()
+        for business_id, business_usages in parse_usage_header(headers.get('x-business-use-case-usage')).items():
+            scope = ('business', str(business_id))
+            business_ids.add(scope[1])
+            for business_usage in business_usages:
+                pct = max(business_usage.get('call_count', 0),
+                          business_usage.get('total_cputime', 0),
+                          business_usage.get('total_time', 0))
+                category = 'insights' if business_usage.get('type') == 'ads_insights' else 'all'
+                usages[(scope, category)] = max(usages.get((scope, category), 0), pct)
+                regain_seconds = 60 * business_usage.get('estimated_time_to_regain_access', 0)
+                if regain_seconds:
+                    blocked[scope] = max(blocked.get(scope, 0), regain_seconds)
+        account_scope = ('account', account_id)
+        account_usage = parse_usage_header(headers.get('x-ad-account-usage'))
+        if 'acc_id_util_pct' in account_usage:
+            usages[(account_scope, 'all')] = account_usage['acc_id_util_pct']
+            if account_usage['acc_id_util_pct'] >= 100 and account_usage.get('reset_time_duration'):
+                blocked[account_scope] = account_usage['reset_time_duration']
+        insights_throttle = parse_usage_header(headers.get('x-fb-ads-insights-throttle'))
+        if 'acc_id_util_pct' in insights_throttle:
+            usages[(account_scope, 'insights')] = insights_throttle['acc_id_util_pct']
+        if 'app_id_util_pct' in insights_throttle:
+            usages[(('app', None), 'insights')] = insights_throttle['app_id_util_pct']
+
+        with self.lock:
+            now = time.time()
+            for key, pct in usages.items():
+                self.usages[key] = (pct, now)
+            for scope, seconds in blocked.items():
+                self.blocked_until[scope] = max(self.blocked_until.get(scope, 0), now + seconds)
+            if business_ids:
+                self.businesses.setdefault(account_id, set()).update(business_ids)
+
+    def current_usage(self, account_id, insights, now):
+        """
+        Returns the highest recent usage that paces the requests of
+        `account_id`, and the time until which they are held. Without an
+        account every scope applies. Must be called holding the lock.
+        """
+        scopes = None
+        if account_id is not None:
+            scopes = {('account', account_id), ('app', None)}
+            scopes.update(('business', business_id) for business_id in self.businesses.get(account_id, ()))
+        usage = 0
+        for (scope, category), (pct, observed_at) in self.usages.items():
+            if now - observed_at > RATE_LIMIT_USAGE_STALE_SECONDS:
+                continue
+            if (scopes is None or scope in scopes) and (insights or category == 'all'):
+                usage = max(usage, pct)
+        blocked_until = max([until for scope, until in self.blocked_until.items() if scopes is None or scope in scopes],
+                            default=0)
+        return usage, blocked_until
+
+    def delay(self, path):
+        """
+        Returns how far apart the requests to `path` are spaced, or how long
+        they are held, insights requests also being paced on the insights
+        usage.
+        """
+        insights = 'insights' in str(path)
+        with self.lock:
+            now = time.time()
+            usage, blocked_until = self.current_usage(request_account_id(path), insights, now)
+        if blocked_until > now:
+            return blocked_until - now
+        return get_pacing_delay(usage)
+
+    def wait(self, path):
+        """
+        Waits for the next request slot of the account of `path`. Slots are
+        taken under the lock, so the requests of every thread together are
+        spaced by the pacing delay.
+        """
+        account_id = request_account_id(path)
+        insights = 'insights' in str(path)
+        with self.lock:
+            now = time.time()
+            usage, blocked_until = self.current_usage(account_id, insights, now)
+            key = (account_id, insights)
+            start = max(now, blocked_until, self.next_request.get(key, 0))
+            self.next_request[key] = start + get_pacing_delay(usage)
+        if start > now:
+            LOGGER.info('Facebook API usage is at %d%%, waiting %.1f seconds before the next request',
+                        usage, start - now)
+            time.sleep(start - now)
+
+def get_pacing_delay(usage):
+    """
+    Returns the delay between requests for a usage percentage, growing from 0
+    at `rate_limit_target_pct` to RATE_LIMIT_MAX_PACING_SECONDS at 100%.
+    """
+    target = float(CONFIG.get('rate_limit_target_pct') or RATE_LIMIT_TARGET_PCT)
+    if usage <= target or target >= 100:
+        return 0
+    return RATE_LIMIT_MAX_PACING_SECONDS * min(usage - target, 100 - target) / (100 - target)
+
+def request_account_id(path):
+    """
+    Returns the ad account of a request, named in its path or else the one
+    being synced by the current thread.
+    """
+    match = ACCOUNT_PATH_PATTERN.search(str(path))
+    return match.group(1) if match else ACCOUNT_ID.get()
+
+def submit_in_context(executor, fn, *args):
+    """
+    Submits `fn` to `executor`, running it with the context variables of the
+    caller, such as the ad account being synced.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+def parse_usage_header(value):
+    if not value:
+        return {}
+    try:
+        return json.loads(value)
+    except ValueError:
+        LOGGER.warning('Could not parse Facebook usage header %s', value)
+        return {}
+
+GOVERNOR = RequestGovernor()
+
 original_call = FacebookAdsApi.call
 
+def governed_call(self, method, path, params=None, headers=None, files=None, url_override=None, api_version=None,):
+    """
+    Waits for the governor before the original function call and feeds it the
+    usage headers of the response, including failed ones
+    """
+    GOVERNOR.wait(path)
+    try:
+        response = original_call(
+            self,
+            method,
+            path,
+            params,
+            headers,
+            files,
+            url_override,
+            api_version,)
+    except FacebookRequestError as ex:
+        GOVERNOR.observe(ex.http_headers(), request_account_id(path))
+        raise
+    GOVERNOR.observe(response.headers(), request_account_id(path))
+    return response
+
 @retry_on_summary_param_error(backoff.expo, (FacebookRequestError), max_tries=5, factor=5)
 def call_with_retry(self, method, path, params=None, headers=None, files=None, url_override=None, api_version=None,):
     """
     Adding the retry decorator on the original function call
     """
-    return original_call(
+    return governed_call(
         self,
         method,
         path,
@@ -148,8 +378,52 @@ class TapFacebookException(Exception):
 class InsightsJobTimeout(TapFacebookException):
     pass
 
+class InsightsJobFailed(TapFacebookException):
+    pass
+
+# The date-time formats returned by the Graph API, e.g. 2024-01-02T03:04:05+0000 and 2024-01-02
+GRAPH_DATETIME_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})'
+                                    r'(?:T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?'
+                                    r'(?:(Z)|([+-])(\d{2}):?(\d{2}))?)?')
+
+def parse_graph_datetime(dts):
+    """
+    Parses the date-time formats returned by the Graph API, returning None for
+    any other input.
+    """
+    match = GRAPH_DATETIME_PATTERN.fullmatch(dts)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, fraction, zulu, sign, offset_hours, offset_minutes = match.groups()
+    tzinfo = None
+    if zulu:
+        tzinfo = timezone.utc
+    elif sign:
+        offset = datetime.timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+        tzinfo = datetime.timezone(-offset if sign == '-' else offset)
+    try:
+        return datetime.datetime(int(year), int(month), int(day),
+                                 int(hour or 0), int(minute or 0), int(second or 0),
+                                 int((fraction or '0').ljust(6, '0')), tzinfo)
+    except ValueError:
+        return None
+
+def parse_epoch(dts):
+    """
+    Returns the epoch seconds of a date-time string, naive ones being in UTC.
+    """
+    parsed_dt = parse_graph_datetime(dts) if isinstance(dts, str) else None
+    if parsed_dt is None:
+        return pendulum.parse(dts).timestamp()
+    if parsed_dt.tzinfo is None:
+        parsed_dt = parsed_dt.replace(tzinfo=timezone.utc)
+    return parsed_dt.timestamp()
+
+@functools.lru_cache(maxsize=DATETIME_CACHE_SIZE)
 def transform_datetime_string(dts):
-    parsed_dt = dateutil.parser.parse(dts)
+    parsed_dt = parse_graph_datetime(dts)
+    if parsed_dt is None:
+        parsed_dt = dateutil.parser.parse(dts)
     if parsed_dt.tzinfo is None:
         parsed_dt = parsed_dt.replace(tzinfo=timezone.utc)
     else:
@@ -174,6 +448,74 @@ def iter_delivery_info_filter(stream_type):
         filt['value'] = filt_values[i:i+sub_list_length]
         yield filt
 
+class ConsumerStopped(Exception):
+    pass
+
+def iter_concurrently(producers, max_workers):
+    """
+    Yields the items of the iterables returned by the `producers` callables as
+    they arrive, running up to `max_workers` producers at once on background
+    threads. Items of a single producer keep their order and the first error
+    raised by a producer is raised to the consumer.
+    """
+    def emit_items(producer, emit):
+        for item in producer():
+            emit(item)
+    return iter_emitted([partial(emit_items, producer) for producer in producers], max_workers)
+
+def iter_emitted(tasks, max_workers, stop=None):
+    """
+    Yields the items the `tasks` callables pass to the `emit` function they
+    are called with, running up to `max_workers` tasks at once on background
+    threads. Items of a single task keep their order and the first error
+    raised by a task is raised to the consumer. `emit` raises ConsumerStopped
+    once the consumer stopped, which also sets the `stop` event.
+    """
+    items = queue.Queue(maxsize=CONCURRENT_QUEUE_SIZE)
+    stop = threading.Event() if stop is None else stop
+    done = object()
+
+    def put(message):
+        # Give up once the consumer stopped instead of blocking on a full queue forever
+        while not stop.is_set():
+            try:
+                items.put(message, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def emit(item):
+        if not put((item, None)):
+            raise ConsumerStopped()
+
+    def run(task):
+        try:
+            task(emit)
+            put((done, None))
+        except ConsumerStopped:
+            pass
+        except Exception as ex: # pylint: disable=broad-except
+            put((done, ex))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for task in tasks:
+            submit_in_context(executor, run, task)
+
+        remaining = len(tasks)
+        while remaining:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
 def raise_from(singer_error, fb_error):
     """Makes a pretty error message out of FacebookError object
 
@@ -194,7 +536,7 @@ def raise_from(singer_error, fb_error):
         error_message = str(fb_error)
     raise singer_error(error_message) from fb_error
 
-def retry_pattern(backoff_type, exception, **wait_gen_kwargs):
+def retry_pattern(backoff_type, exception, give_up=None, **wait_gen_kwargs):
     def log_retry_attempt(details):
         _, exception, _ = sys.exc_info()
         LOGGER.info(exception)
@@ -209,6 +551,7 @@ def retry_pattern(backoff_type, exception, **wait_gen_kwargs):
             return True
         elif isinstance(exception, FacebookRequestError):
             return (exception.api_transient_error()
+                    or exception.api_error_code() in THROTTLING_ERROR_CODES
                     or exception.api_error_subcode() == 99
                     or exception.http_status() in (500, 503)
                     # This subcode corresponds to a race condition between AdsInsights job creation and polling
@@ -225,10 +568,126 @@ def retry_pattern(backoff_type, exception, **wait_gen_kwargs):
         exception,
         jitter=None,
         on_backoff=log_retry_attempt,
-        giveup=lambda exc: not should_retry_api_error(exc),
+        giveup=lambda exc: not should_retry_api_error(exc) or (give_up is not None and give_up(exc)),
         **wait_gen_kwargs
     )
 
+def is_page_size_error(exception):
+    """
+    Returns True for the errors a smaller page may avoid: Facebook asking to
+    reduce the amount of data requested, and requests timing out.
+    """
+    return isinstance(exception, Timeout) or is_reduce_data_error(exception)
+
+def is_reduce_data_error(exception):
+    return (isinstance(exception, FacebookRequestError)
+            and 'reduce the amount of data' in (exception.api_error_message() or ''))
+
+class PageSize():
+    """
+    Number of objects requested per page when listing a stream. With
+    `auto_tune_page_size` the size doubles after every page that returns
+    within PAGE_SIZE_FAST_SECONDS, and halves when a page fails with a page
+    size error, never growing back to a size that failed.
+    """
+    def __init__(self, limit, auto_tune=False):
+        self.lock = threading.Lock()
+        self.limit = limit
+        self.auto_tune = auto_tune
+        self.max_limit = max(limit, MAX_PAGE_SIZE)
+
+    def succeeded(self, seconds):
+        if not self.auto_tune or seconds >= PAGE_SIZE_FAST_SECONDS:
+            return
+        with self.lock:
+            self.limit = min(self.limit * 2, self.max_limit)
+
+    def can_shrink(self, exception):
+        return self.auto_tune and is_page_size_error(exception) and self.limit > MIN_PAGE_SIZE
+
+    def failed(self, exception):
+        """
+        Returns True when the page should be requested again with the
+        reduced size.
+        """
+        with self.lock:
+            if not self.can_shrink(exception):
+                return False
+            self.max_limit = self.limit - 1
+            self.limit = max(self.limit // 2, MIN_PAGE_SIZE)
+            LOGGER.info('Reducing the page size to %s after: %s', self.limit, exception)
+        return True
+
+def get_page_size(stream_name, default=None):
+    """
+    Returns the PageSize of a stream, starting from its entry in the
+    `page_sizes` config, e.g. {"ads": 500}, or `default`.
+    """
+    page_sizes = CONFIG.get('page_sizes') or {}
+    if isinstance(page_sizes, str):
+        page_sizes = json.loads(page_sizes)
+    limit = int(page_sizes.get(stream_name) or default or RESULT_RETURN_LIMIT)
+    return PageSize(limit, auto_tune=str(CONFIG.get('auto_tune_page_size', 'false')).lower() == 'true')
+
+def page_size_can_shrink(exception):
+    """
+    Returns True when the failed request loads the first page of a listing
+    that is requested again with a smaller page, instead of being retried.
+    """
+    page_size = LISTING_PAGE_SIZE.get()
+    return page_size is not None and page_size.can_shrink(exception)
+
+def iter_pages(request, params, page_size):
+    """
+    Yields the objects listed by `request(params=params)` page after page,
+    requesting every page with the current limit of `page_size`. A page that
+    fails with a page size error is requested again once the size is reduced.
+    """
+    for objects, _ in iter_page_lists(request, params, page_size):
+        yield from objects
+
+def iter_page_lists(request, params, page_size):
+    """
+    Yields (objects, after) for every page listed like `iter_pages` does,
+    `after` being the paging cursor of the next page, None after the last.
+    """
+    while True:
+        started = time.monotonic()
+        token = LISTING_PAGE_SIZE.set(page_size)
+        try:
+            # Requesting the edge loads its first page
+            cursor = request(params=dict(params, limit=page_size.limit))
+            break
+        except (FacebookRequestError, Timeout) as ex:
+            if not page_size.failed(ex):
+                raise
+        finally:
+            LISTING_PAGE_SIZE.reset(token)
+    page_size.succeeded(time.monotonic() - started)
+    yield from iter_cursor_page_lists(cursor, page_size)
+
+def iter_cursor_page_lists(cursor, page_size):
+    if not isinstance(cursor, Cursor):
+        yield cursor, None
+        return
+    while True:
+        objects = cursor._queue # pylint: disable=protected-access
+        cursor._queue = [] # pylint: disable=protected-access
+        finished = cursor._finished_iteration # pylint: disable=protected-access
+        yield objects, None if finished else cursor.params.get('after')
+        if finished:
+            return
+        started = time.monotonic()
+        cursor.params['limit'] = page_size.limit
+        try:
+            if not cursor.load_next_page():
+                return
+        except (FacebookRequestError, Timeout) as ex:
+            if not page_size.failed(ex):
+                raise
+            continue
+        page_size.succeeded(time.monotonic() - started)
+
 @attr.s
 class Stream(object):
     name = attr.ib()
@@ -236,31 +695,57 @@ class Stream(object):
     stream_alias = attr.ib()
     catalog_entry = attr.ib()
     replication_method = 'FULL_TABLE'
+    # Any of them is set once the sync of the stream should stop, e.g. after another account or stream failed
+    stop_events = ()
+
+    def stopped(self):
+        return any(stop_event.is_set() for stop_event in self.stop_events)
 
     def automatic_fields(self):
-        fields = set()
-        if self.catalog_entry:
-            props = metadata.to_map(self.catalog_entry.metadata)
-            for breadcrumb, data in props.items():
-                if len(breadcrumb) != 2:
-                    continue # Skip root and nested metadata
+        return self.field_sets()[0]
 
-                if data.get('inclusion') == 'automatic':
-                    fields.add(breadcrumb[1])
-        return fields
+    def default_page_size(self):
+        return RESULT_RETURN_LIMIT
 
+    def page_size(self):
+        """
+        Returns the PageSize the stream is listed with, kept for the whole
+        sync so what auto-tuning learnt on a page carries to the next ones.
+        """
+        if getattr(self, '_page_size', None) is None:
+            self._page_size = get_page_size(self.name, self.default_page_size()) # pylint: disable=attribute-defined-outside-init
+        return self._page_size
 
     def fields(self):
+        return self.field_sets()[1]
+
+    def field_sets(self):
+        """
+        Returns the automatic fields and the selected fields of the stream as
+        frozensets, walking the catalog metadata again only once the catalog
+        entry or its metadata is replaced.
+        """
+        catalog_entry = self.catalog_entry
+        catalog_metadata = getattr(catalog_entry, 'metadata', None)
+        cached = getattr(self, '_field_sets_cache', None)
+        if cached and cached[0] is catalog_entry and cached[1] is catalog_metadata:
+            return cached[2]
+
+        automatic_fields = set()
         fields = set()
-        if self.catalog_entry:
-            props = metadata.to_map(self.catalog_entry.metadata)
+        if catalog_entry:
+            props = metadata.to_map(catalog_metadata)
             for breadcrumb, data in props.items():
                 if len(breadcrumb) != 2:
                     continue # Skip root and nested metadata
 
+                if data.get('inclusion') == 'automatic':
+                    automatic_fields.add(breadcrumb[1])
                 if data.get('selected') or data.get('inclusion') == 'automatic':
                     fields.add(breadcrumb[1])
-        return fields
+        field_sets = (frozenset(automatic_fields), frozenset(fields))
+        self._field_sets_cache = (catalog_entry, catalog_metadata, field_sets) # pylint: disable=attribute-defined-outside-init
+        return field_sets
 
 @attr.s
 class IncrementalStream(Stream):
@@ -270,31 +755,43 @@ class IncrementalStream(Stream):
 
     def __attrs_post_init__(self):
         self.current_bookmark = get_start(self, UPDATED_TIME_KEY)
+        # Epoch seconds of the bookmark, compared to the updated time of every listed object
+        self.current_bookmark_epoch = self.current_bookmark.timestamp() if self.current_bookmark else None
+
+    def edge_fields(self):
+        """Every selected field is requested from the listing edge, no object is read on its own"""
+        return self.fields()
+
+    def prepare_record(self, obj):
+        return obj.export_all_data()
 
     def _iterate(self, generator, record_preparation):
         max_bookmark = None
+        max_bookmark_epoch = None
         for recordset in generator:
             for record in recordset:
-                updated_at = pendulum.parse(record[UPDATED_TIME_KEY])
+                updated_time = record[UPDATED_TIME_KEY]
+                updated_at = parse_epoch(updated_time)
 
-                if self.current_bookmark and self.current_bookmark >= updated_at:
+                if self.current_bookmark_epoch is not None and self.current_bookmark_epoch >= updated_at:
                     continue
-                if not max_bookmark or updated_at > max_bookmark:
-                    max_bookmark = updated_at
+                if max_bookmark_epoch is None or updated_at > max_bookmark_epoch:
+                    max_bookmark = updated_time
+                    max_bookmark_epoch = updated_at
 
                 record = record_preparation(record)
                 yield {'record': record}
 
             if max_bookmark:
-                yield {'state': advance_bookmark(self, UPDATED_TIME_KEY, max_bookmark.isoformat())}
+                yield {'state': advance_bookmark(self, UPDATED_TIME_KEY, max_bookmark)}
 
 
-def batch_record_success(response, stream=None, transformer=None, schema=None):
+def batch_record_success(response, stream=None, transformer=None, schema=None, writer=None):
     '''A success callback for the FB Batch endpoint used when syncing AdCreatives. Needs the stream
     to resolve schema refs and transform the successful response object.'''
     rec = response.json()
     record = transformer.transform(rec, schema)
-    singer.write_record(stream.name, record, stream.stream_alias, utils.now())
+    writer.write_record(stream, record, utils.now())
 
 
 def batch_record_failure(response):
@@ -302,18 +799,57 @@ def batch_record_failure(response):
     so it fails the sync process.'''
     raise response.error()
 
+def batch_object_success(response, index=None, results=None):
+    '''A success callback for the FB Batch endpoint used when fetching AdCreatives in batches. Stores
+    the response data under the index of its object.'''
+    results[index] = response.json()
+
+
+def batch_object_failure(response, errors=None):
+    '''A failure callback for the FB Batch endpoint used when fetching AdCreatives in batches. Collects
+    the error so the other responses of the batch are still stored.'''
+    errors.append(response.error())
+
+
+@retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
+# Added retry_pattern to handle AttributeError raised from api_batch.execute() below
+@retry_pattern(backoff.expo, (FacebookRequestError, FacebookBadObjectError, AttributeError), max_tries=5, factor=5)
+def execute_object_batch(objects, fields, results):
+    '''Reads `fields` of every object that has no entry in `results` yet with one Graph batch
+    request. Responses are stored in `results` by object index, so a retry only requests the
+    objects whose sub-request failed.'''
+    api_batch = API.new_batch()
+    errors = []
+    for index, obj in enumerate(objects):
+        if index in results:
+            continue
+        obj.api_get(fields=fields,
+                    batch=api_batch,
+                    success=partial(batch_object_success, index=index, results=results),
+                    failure=partial(batch_object_failure, errors=errors))
+
+    retry_batch = api_batch.execute()
+    if errors:
+        raise errors[0]
+    if retry_batch:
+        raise FacebookBadObjectError('Batch request returned no response for {} objects'.format(len(retry_batch)))
+
 # AdCreative is not an iterable stream as it uses the batch endpoint
+@attr.s
 class AdCreative(Stream):
     '''
     doc: https://developers.facebook.com/docs/marketing-api/reference/adgroup/adcreatives/
     '''
 
+    # Only used by `adcreative_incremental`
+    state = attr.ib(default=None)
+
     # Added retry_pattern to handle AttributeError raised from api_batch.execute() below
     @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
-    def sync_batches(self, stream_objects):
-        refs = load_shared_schema_refs()
-        schema = singer.resolve_schema_references(self.catalog_entry.schema.to_dict(), refs)
-        transformer = Transformer(pre_hook=transform_date_hook)
+    def sync_batches(self, stream_objects, writer=None):
+        writer = writer or MessageWriter()
+        schema = SCHEMAS.catalog_schema(self.catalog_entry)
+        transformer = RecordTransformer()
 
         # Create the initial batch
         api_batch = API.new_batch()
@@ -322,31 +858,135 @@ class AdCreative(Stream):
         # This loop syncs minimal fb objects
         for obj in stream_objects:
             # Execute and create a new batch for every 50 added
-            if batch_count % 50 == 0:
+            if batch_count % BATCH_SIZE == 0:
                 api_batch.execute()
                 api_batch = API.new_batch()
 
             # Add a call to the batch with the full object
             obj.api_get(fields=self.fields(),
                         batch=api_batch,
-                        success=partial(batch_record_success, stream=self, transformer=transformer, schema=schema),
+                        success=partial(batch_record_success, stream=self, transformer=transformer, schema=schema, writer=writer),
                         failure=batch_record_failure)
             batch_count += 1
 
         # Ensure the final batch is executed
         api_batch.execute()
+        writer.flush()
+
+    def sync_batches_pipelined(self, stream_objects, writer, max_batches):
+        """
+        Syncs creatives with up to `max_batches` batch requests in flight. The
+        creatives are listed on a background thread and fetched by a pool of
+        batch requests while the records of finished batches are transformed
+        and written here, in listing order.
+        """
+        schema = SCHEMAS.catalog_schema(self.catalog_entry)
+        transformer = RecordTransformer()
+        fields = self.fields()
+
+        def fetch(chunk):
+            results = {}
+            # Retries only the sub-requests of the batch that failed
+            execute_object_batch(chunk, fields, results)
+            return [results[index] for index in range(len(chunk))]
+
+        creatives = iter_concurrently([lambda: stream_objects], 1)
+        chunks = iter(lambda: list(itertools.islice(creatives, BATCH_SIZE)), [])
+        in_flight = deque()
+        executor = ThreadPoolExecutor(max_workers=max_batches)
+        try:
+            for chunk in chunks:
+                in_flight.append(submit_in_context(executor, fetch, chunk))
+                if len(in_flight) >= max_batches:
+                    for rec in in_flight.popleft().result():
+                        writer.write_record(self, transformer.transform(rec, schema), utils.now())
+            while in_flight:
+                for rec in in_flight.popleft().result():
+                    writer.write_record(self, transformer.transform(rec, schema), utils.now())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        writer.flush()
 
     key_properties = ['id']
 
-    @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
+    @retry_pattern(backoff.expo, (Timeout, ConnectionError), give_up=page_size_can_shrink, max_tries=5, factor=2)
     # Added retry_pattern to handle AttributeError raised from account.get_ad_creatives() below
-    @retry_pattern(backoff.expo, (FacebookRequestError, TypeError, AttributeError), max_tries=5, factor=5)
-    def get_adcreatives(self):
-        return self.account.get_ad_creatives(params={'limit': RESULT_RETURN_LIMIT})
+    @retry_pattern(backoff.expo, (FacebookRequestError, TypeError, AttributeError), give_up=page_size_can_shrink, max_tries=5, factor=5)
+    def get_adcreatives(self, params=None):
+        return self.account.get_ad_creatives(params=params)
 
-    def sync(self):
-        adcreatives = self.get_adcreatives()
-        self.sync_batches(adcreatives)
+    def list_adcreatives(self):
+        creatives = iter_pages(self.get_adcreatives, {}, self.page_size())
+        # The first page is requested right away, so a failing listing fails before any batch is sent
+        first_creatives = list(itertools.islice(creatives, 1))
+        return itertools.chain(first_creatives, creatives)
+
+    @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
+    # Added retry_pattern to handle AttributeError raised from account.get_ads() below
+    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
+    def get_changed_adcreative_ids(self, since):
+        """
+        Returns the ids of the creatives used by the ads updated after `since`
+        and the latest updated_time of those ads. A new creative comes with an
+        ad update, but edits of a creative's name, status or adlabels leave its
+        ads untouched and are only synced by a full refresh.
+        """
+        params = {'filtering': [{'field': 'ad.' + UPDATED_TIME_KEY, 'operator': 'GREATER_THAN', 'value': since.int_timestamp}]}
+        get_ads = partial(self.account.get_ads, fields=['creative', UPDATED_TIME_KEY]) # pylint: disable=no-member
+        creative_ids = set()
+        max_updated_time = None
+        max_updated_epoch = None
+        for ad in iter_pages(get_ads, params, self.page_size()):
+            if ad.get('creative'):
+                creative_ids.add(ad['creative']['id'])
+            updated_epoch = parse_epoch(ad[UPDATED_TIME_KEY])
+            if max_updated_epoch is None or updated_epoch > max_updated_epoch:
+                max_updated_time = ad[UPDATED_TIME_KEY]
+                max_updated_epoch = updated_epoch
+        return sorted(creative_ids), max_updated_time
+
+    def sync_creatives(self, creatives, writer=None):
+        max_batches = int(CONFIG.get('adcreative_max_concurrent_batches') or 1)
+        if max_batches > 1:
+            self.sync_batches_pipelined(creatives, writer or MessageWriter(), max_batches)
+        else:
+            self.sync_batches(creatives, writer)
+
+    def sync(self, writer=None):
+        """
+        Syncs every creative of the account. With `adcreative_incremental`
+        only the creatives of the ads updated since the bookmark are synced,
+        every creative being synced again on the first sync and then once
+        `adcreative_full_refresh_days` passed since the last full sync. Edits
+        of a creative that do not update its ads are only picked up by those
+        full refreshes, and without `adcreative_full_refresh_days` there is
+        none after the first sync.
+        """
+        if CONFIG.get('adcreative_incremental', 'false').lower() != 'true':
+            self.sync_creatives(self.list_adcreatives(), writer)
+            return
+
+        writer = writer or MessageWriter()
+        if self.state is None:
+            self.state = {}
+        now = pendulum.now('UTC')
+        bookmark = singer.get_bookmark(self.state, self.name, UPDATED_TIME_KEY)
+        last_full_refresh = singer.get_bookmark(self.state, self.name, 'last_full_refresh')
+        full_refresh_days = int(CONFIG.get('adcreative_full_refresh_days') or 0)
+        if (bookmark is None or last_full_refresh is None
+                or (full_refresh_days and pendulum.parse(last_full_refresh).add(days=full_refresh_days) <= now)):
+            LOGGER.info('Syncing every creative of the account')
+            self.sync_creatives(self.list_adcreatives(), writer)
+            # Ads updated while the creatives were listed are picked up by the next sync
+            singer.write_bookmark(self.state, self.name, UPDATED_TIME_KEY, now.isoformat())
+            singer.write_bookmark(self.state, self.name, 'last_full_refresh', now.isoformat())
+        else:
+            creative_ids, max_updated_time = self.get_changed_adcreative_ids(pendulum.parse(bookmark))
+            LOGGER.info('Syncing %s creatives of the ads updated since %s', len(creative_ids), bookmark)
+            self.sync_creatives([adcreative.AdCreative(creative_id) for creative_id in creative_ids], writer)
+            if max_updated_time:
+                singer.write_bookmark(self.state, self.name, UPDATED_TIME_KEY, pendulum.parse(max_updated_time).isoformat())
+        writer.write_state(self, self.state)
 
 
 class Ads(IncrementalStream):
@@ -356,44 +996,40 @@ class Ads(IncrementalStream):
 
     key_properties = ['id', 'updated_time']
 
-    @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
+    @retry_pattern(backoff.expo, (Timeout, ConnectionError), give_up=page_size_can_shrink, max_tries=5, factor=2)
     # Added retry_pattern to handle AttributeError raised from account.get_ads() below
-    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
+    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), give_up=page_size_can_shrink, max_tries=5, factor=5)
     def _call_get_ads(self, params):
         """
         This is necessary because the functions that call this endpoint return
         a generator, whose calls need decorated with a backoff.
         """
-        return self.account.get_ads(fields=self.automatic_fields(), params=params) # pylint: disable=no-member
+        return self.account.get_ads(fields=self.edge_fields(), params=params) # pylint: disable=no-member
 
     def __iter__(self):
         def do_request():
-            params = {'limit': RESULT_RETURN_LIMIT}
+            params = {}
             if self.current_bookmark:
                 params.update({'filtering': [{'field': 'ad.' + UPDATED_TIME_KEY, 'operator': 'GREATER_THAN', 'value': self.current_bookmark.int_timestamp}]})
-            yield self._call_get_ads(params)
+            yield iter_pages(self._call_get_ads, params, self.page_size())
 
         def do_request_multiple():
-            params = {'limit': RESULT_RETURN_LIMIT}
+            params = {}
             bookmark_params = []
             if self.current_bookmark:
                 bookmark_params.append({'field': 'ad.' + UPDATED_TIME_KEY, 'operator': 'GREATER_THAN', 'value': self.current_bookmark.int_timestamp})
-            for del_info_filt in iter_delivery_info_filter('ad'):
-                params.update({'filtering': [del_info_filt] + bookmark_params})
-                filt_ads = self._call_get_ads(params)
-                yield filt_ads
-
-        @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
-        # Added retry_pattern to handle AttributeError raised from ad.api_get() below
-        @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
-        def prepare_record(ad):
-            return ad.api_get(fields=self.fields()).export_all_data()
+            slices = [partial(iter_pages, self._call_get_ads, dict(params, filtering=[dict(del_info_filt)] + bookmark_params),
+                              self.page_size())
+                      for del_info_filt in iter_delivery_info_filter('ad')]
+            # The slices are listed concurrently into a single recordset, so the
+            # bookmark only advances once every slice has been synced
+            yield iter_concurrently(slices, DELIVERY_INFO_FILTER_WORKERS)
 
         if CONFIG.get('include_deleted', 'false').lower() == 'true':
             ads = do_request_multiple()
         else:
             ads = do_request()
-        for message in self._iterate(ads, prepare_record):
+        for message in self._iterate(ads, self.prepare_record):
             yield message
 
 
@@ -404,94 +1040,109 @@ class AdSets(IncrementalStream):
 
     key_properties = ['id', 'updated_time']
 
-    @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
+    @retry_pattern(backoff.expo, (Timeout, ConnectionError), give_up=page_size_can_shrink, max_tries=5, factor=2)
     # Added retry_pattern to handle AttributeError raised from account.get_ad_sets() below
-    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
+    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), give_up=page_size_can_shrink, max_tries=5, factor=5)
     def _call_get_ad_sets(self, params):
         """
         This is necessary because the functions that call this endpoint return
         a generator, whose calls need decorated with a backoff.
         """
-        return self.account.get_ad_sets(fields=self.automatic_fields(), params=params) # pylint: disable=no-member
+        return self.account.get_ad_sets(fields=self.edge_fields(), params=params) # pylint: disable=no-member
 
     def __iter__(self):
         def do_request():
-            params = {'limit': RESULT_RETURN_LIMIT}
+            params = {}
             if self.current_bookmark:
                 params.update({'filtering': [{'field': 'adset.' + UPDATED_TIME_KEY, 'operator': 'GREATER_THAN', 'value': self.current_bookmark.int_timestamp}]})
-            yield self._call_get_ad_sets(params)
+            yield iter_pages(self._call_get_ad_sets, params, self.page_size())
 
         def do_request_multiple():
-            params = {'limit': RESULT_RETURN_LIMIT}
+            params = {}
             bookmark_params = []
             if self.current_bookmark:
                 bookmark_params.append({'field': 'adset.' + UPDATED_TIME_KEY, 'operator': 'GREATER_THAN', 'value': self.current_bookmark.int_timestamp})
-            for del_info_filt in iter_delivery_info_filter('adset'):
-                params.update({'filtering': [del_info_filt] + bookmark_params})
-                filt_adsets = self._call_get_ad_sets(params)
-                yield filt_adsets
-
-        @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
-        # Added retry_pattern to handle AttributeError raised from ad_set.api_get() below
-        @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
-        def prepare_record(ad_set):
-            return ad_set.api_get(fields=self.fields()).export_all_data()
+            slices = [partial(iter_pages, self._call_get_ad_sets, dict(params, filtering=[dict(del_info_filt)] + bookmark_params),
+                              self.page_size())
+                      for del_info_filt in iter_delivery_info_filter('adset')]
+            # The slices are listed concurrently into a single recordset, so the
+            # bookmark only advances once every slice has been synced
+            yield iter_concurrently(slices, DELIVERY_INFO_FILTER_WORKERS)
 
         if CONFIG.get('include_deleted', 'false').lower() == 'true':
             ad_sets = do_request_multiple()
         else:
             ad_sets = do_request()
 
-        for message in self._iterate(ad_sets, prepare_record):
+        for message in self._iterate(ad_sets, self.prepare_record):
             yield message
 
 class Campaigns(IncrementalStream):
 
     key_properties = ['id']
 
-    @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
+    def edge_fields(self):
+        # ads is not a field under campaigns in the SDK, it is read from the ads edge of every campaign
+        return super().edge_fields() - {'ads'}
+
+    @retry_pattern(backoff.expo, (Timeout, ConnectionError), give_up=page_size_can_shrink, max_tries=5, factor=2)
     # Added retry_pattern to handle AttributeError raised from account.get_campaigns() below
-    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
+    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), give_up=page_size_can_shrink, max_tries=5, factor=5)
     def _call_get_campaigns(self, params):
         """
         This is necessary because the functions that call this endpoint return
         a generator, whose calls need decorated with a backoff.
         """
-        return self.account.get_campaigns(fields=self.automatic_fields(), params=params) # pylint: disable=no-member
+        return self.account.get_campaigns(fields=self.edge_fields(), params=params) # pylint: disable=no-member
+
+    @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
+    # Added retry_pattern to handle AttributeError raised from account.get_ads() below
+    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
+    def get_ad_ids_by_campaign(self):
+        """
+        Maps campaign ids to the ids of their ads with a single scan of the
+        account's ads, instead of listing the ads of every campaign.
+        """
+        ad_ids_by_campaign = {}
+        get_ads = partial(self.account.get_ads, fields=['id', 'campaign_id']) # pylint: disable=no-member
+        for ad in iter_pages(get_ads, {}, self.page_size()):
+            ad_ids_by_campaign.setdefault(ad['campaign_id'], []).append(ad['id'])
+        return ad_ids_by_campaign
 
     def __iter__(self):
         # ads is not a field under campaigns in the SDK. To add ads to this stream, we have to make a separate request
-        props = self.fields()
-        fields = [k for k in props if k != 'ads']
-        pull_ads = 'ads' in props
+        pull_ads = 'ads' in self.fields()
 
         def do_request():
-            params = {'limit': RESULT_RETURN_LIMIT}
+            params = {}
             if self.current_bookmark:
                 params.update({'filtering': [{'field': 'campaign.' + UPDATED_TIME_KEY, 'operator': 'GREATER_THAN', 'value': self.current_bookmark.int_timestamp}]})
-            yield self._call_get_campaigns(params)
+            yield iter_pages(self._call_get_campaigns, params, self.page_size())
 
         def do_request_multiple():
-            params = {'limit': RESULT_RETURN_LIMIT}
+            params = {}
             bookmark_params = []
             if self.current_bookmark:
                 bookmark_params.append({'field': 'campaign.' + UPDATED_TIME_KEY, 'operator': 'GREATER_THAN', 'value': self.current_bookmark.int_timestamp})
-            for del_info_filt in iter_delivery_info_filter('campaign'):
-                params.update({'filtering': [del_info_filt] + bookmark_params})
-                filt_campaigns = self._call_get_campaigns(params)
-                yield filt_campaigns
-
-        @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
-        # Added retry_pattern to handle AttributeError raised from request call below
-        @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
+            slices = [partial(iter_pages, self._call_get_campaigns, dict(params, filtering=[dict(del_info_filt)] + bookmark_params),
+                              self.page_size())
+                      for del_info_filt in iter_delivery_info_filter('campaign')]
+            # The slices are listed concurrently into a single recordset, so the
+            # bookmark only advances once every slice has been synced
+            yield iter_concurrently(slices, DELIVERY_INFO_FILTER_WORKERS)
+
+        # Built on the first campaign that needs it and reused for the rest of the sync
+        ad_ids_by_campaign = None
+
         def prepare_record(campaign):
             """If campaign.ads is selected, make the request and insert the data here"""
-            campaign_out = campaign.api_get(fields=fields).export_all_data()
+            nonlocal ad_ids_by_campaign
+            campaign_out = self.prepare_record(campaign)
             if pull_ads:
-                campaign_out['ads'] = {'data': []}
-                ids = [ad['id'] for ad in campaign.get_ads()]
-                for ad_id in ids:
-                    campaign_out['ads']['data'].append({'id': ad_id})
+                if ad_ids_by_campaign is None:
+                    ad_ids_by_campaign = self.get_ad_ids_by_campaign()
+                ad_ids = ad_ids_by_campaign.get(campaign_out['id'], [])
+                campaign_out['ads'] = {'data': [{'id': ad_id} for ad_id in ad_ids]}
             return campaign_out
 
         if CONFIG.get('include_deleted', 'false').lower() == 'true':
@@ -510,85 +1161,118 @@ class Leads(Stream):
     key_properties = ['id']
     replication_method = 'INCREMENTAL'
 
-    def compare_lead_created_times(self, leadA, leadB):
-        if leadA is None:
-            return leadB
-        timestampA = pendulum.parse(leadA[self.replication_key])
-        timestampB = pendulum.parse(leadB[self.replication_key])
-        if timestampB > timestampA:
-            return leadB
-        else:
-            return leadA
-
-    # Added retry_pattern to handle AttributeError raised from api_batch.execute() below
-    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
-    def sync_batches(self, stream_objects):
-        refs = load_shared_schema_refs()
-        schema = singer.resolve_schema_references(self.catalog_entry.schema.to_dict(), refs)
-        transformer = Transformer(pre_hook=transform_date_hook)
-
-        # Create the initial batch
-        api_batch = API.new_batch()
-        batch_count = 0
-
-        # Keep track of most recent, lead for bookmarking
-        latest_lead = None
-
-        # This loop syncs minimal fb objects
-        for obj in stream_objects:
-
-            latest_lead = self.compare_lead_created_times(latest_lead, obj)
-
-            # Execute and create a new batch for every 50 added
-            if batch_count % 50 == 0:
-                api_batch.execute()
-                api_batch = API.new_batch()
-
-            # Add a call to the batch with the full object
-            obj.api_get(fields=self.fields(),
-                        batch=api_batch,
-                        success=partial(batch_record_success, stream=self, transformer=transformer, schema=schema),
-                        failure=batch_record_failure)
-            batch_count += 1
-
-        # Ensure the final batch is executed
-        api_batch.execute()
-        return pendulum.parse(latest_lead[self.replication_key]).isoformat()
-
-    @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
+    @retry_pattern(backoff.expo, (Timeout, ConnectionError), give_up=page_size_can_shrink, max_tries=5, factor=2)
     # Added retry_pattern to handle AttributeError raised from account.get_ads() below
-    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
-    def get_ads(self):
-        params = {'limit': RESULT_RETURN_LIMIT}
-        yield from self.account.get_ads(params=params)
+    @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), give_up=page_size_can_shrink, max_tries=5, factor=5)
+    def _call_get_ads(self, params):
+        return self.account.get_ads(params=params) # pylint: disable=no-member
+
+    def get_ad_pages(self, after=None):
+        """
+        Yields (ads, after) for every page of ads, `after` being the paging
+        cursor the listing resumes from after these ads.
+        """
+        params = {}
+        if CONFIG.get('leads_lead_gen_ads_only', 'false').lower() == 'true':
+            # Only ads of lead generation campaigns can collect leads through instant forms
+            params['filtering'] = [{'field': 'campaign.objective', 'operator': 'IN', 'value': LEAD_GEN_OBJECTIVES}]
+        if after:
+            params['after'] = after
+        yield from iter_page_lists(self._call_get_ads, params, self.page_size())
 
     @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
     # Added retry_pattern to handle AttributeError raised from ad.get_leads() below
     @retry_pattern(backoff.expo, (FacebookRequestError, AttributeError), max_tries=5, factor=5)
     def get_leads(self, ads, start_time, previous_start_time):
+        """
+        Yields the leads of `ads` created between the two times, read with the
+        selected fields from the leads edge.
+        """
         start_time = int(start_time.timestamp()) # Get unix timestamp
-        params = {'limit': RESULT_RETURN_LIMIT,
-                  'filtering': [{'field': 'time_created',
+        params = {'filtering': [{'field': 'time_created',
                                   'operator': 'GREATER_THAN',
                                   'value': previous_start_time - 1},
                                 {'field': 'time_created',
                                   'operator': 'LESS_THAN',
                                   'value': start_time}]}
-        for ad in ads:
-            yield from ad.get_leads(params=params)
-
-    def sync(self):
-        start_time = pendulum.now('UTC')
-        previous_start_time = self.state.get("bookmarks", {}).get("leads", {}).get(self.replication_key, CONFIG.get('start_date'))
-
-        previous_start_time = pendulum.parse(previous_start_time)
-        ads = self.get_ads()
-        leads = self.get_leads(ads, start_time, int(previous_start_time.timestamp()))
-        latest_lead_time = self.sync_batches(leads)
-
-        if not latest_lead_time is None:
-            singer.write_bookmark(self.state, 'leads', self.replication_key, latest_lead_time)
-            singer.write_state(self.state)
+        fields = self.fields()
+
+        def list_leads(ad):
+            return iter_pages(partial(ad.get_leads, fields=fields), params, self.page_size())
+
+        max_workers = int(CONFIG.get('leads_max_concurrent_ads') or 1)
+        if max_workers == 1:
+            for ad in ads:
+                yield from list_leads(ad)
+            return
+
+        # The leads of up to `leads_max_concurrent_ads` ads are listed at once,
+        # reading the ads a chunk at a time to bound the ads held in memory
+        ads = iter(ads)
+        while True:
+            chunk = list(itertools.islice(ads, LEADS_ADS_PER_CHUNK))
+            if not chunk:
+                return
+            yield from iter_concurrently([partial(list_leads, ad) for ad in chunk], max_workers)
+
+    def sync(self, writer=None):
+        """
+        Syncs the leads created since the bookmark, a page of ads at a time in
+        listing order. After a page whose ads had leads, or every
+        LEADS_CHECKPOINT_ADS ads, the state records the paging cursor of the
+        next page of ads, so a sync that stopped mid-way resumes its time
+        window from there.
+        """
+        writer = writer or MessageWriter()
+        schema = SCHEMAS.catalog_schema(self.catalog_entry)
+        transformer = RecordTransformer()
+        bookmark = self.state.get("bookmarks", {}).get("leads", {})
+        previous_start_time = pendulum.parse(bookmark.get(self.replication_key, CONFIG.get('start_date')))
+
+        if bookmark.get('window_end'):
+            LOGGER.info("resuming leads of the window ending at %s", bookmark['window_end'])
+            start_time = pendulum.parse(bookmark['window_end'])
+            ads_after = bookmark.get('ads_after')
+            latest_lead_time = bookmark.get('latest_created_time')
+        else:
+            start_time = pendulum.now('UTC')
+            ads_after = None
+            latest_lead_time = None
+        latest_lead_epoch = parse_epoch(latest_lead_time) if latest_lead_time else None
+
+        ads_since_checkpoint = 0
+        leads_since_checkpoint = 0
+        for ads, ads_after in self.get_ad_pages(ads_after):
+            for lead in self.get_leads(ads, start_time, int(previous_start_time.timestamp())):
+                record = lead.export_all_data()
+                created_time = record[self.replication_key]
+                created_epoch = parse_epoch(created_time)
+                if latest_lead_epoch is None or created_epoch > latest_lead_epoch:
+                    latest_lead_time = created_time
+                    latest_lead_epoch = created_epoch
+                writer.write_record(self, transformer.transform(record, schema), utils.now())
+                leads_since_checkpoint += 1
+            ads_since_checkpoint += len(ads)
+
+            if ads_after and (leads_since_checkpoint or ads_since_checkpoint >= LEADS_CHECKPOINT_ADS):
+                self.state.setdefault('bookmarks', {})['leads'] = {
+                    self.replication_key: bookmark.get(self.replication_key, CONFIG.get('start_date')),
+                    'window_end': start_time.isoformat(),
+                    'ads_after': ads_after,
+                    'latest_created_time': latest_lead_time,
+                }
+                writer.write_state(self, self.state)
+                ads_since_checkpoint = 0
+                leads_since_checkpoint = 0
+
+        if latest_lead_time is not None:
+            self.state.setdefault('bookmarks', {})['leads'] = {
+                self.replication_key: pendulum.parse(latest_lead_time).isoformat()}
+        elif bookmark.get(self.replication_key):
+            self.state['bookmarks']['leads'] = {self.replication_key: bookmark[self.replication_key]}
+        else:
+            self.state.get('bookmarks', {}).pop('leads', None)
+        writer.write_state(self, self.state)
 
 
 ALL_ACTION_ATTRIBUTION_WINDOWS = [
@@ -606,7 +1290,7 @@ ALL_ACTION_BREAKDOWNS = [
     'action_destination'
 ]
 
-def get_start(stream, bookmark_key):
+def get_start(stream, bookmark_key, log=True):
     tap_stream_id = stream.name
     state = stream.state or {}
     current_bookmark = singer.get_bookmark(state, tap_stream_id, bookmark_key)
@@ -614,31 +1298,123 @@ def get_start(stream, bookmark_key):
         if isinstance(stream, IncrementalStream):
             return None
         else:
-            LOGGER.info("no bookmark found for %s, using start_date instead...%s", tap_stream_id, CONFIG['start_date'])
+            if log:
+                LOGGER.info("no bookmark found for %s, using start_date instead...%s", tap_stream_id, CONFIG['start_date'])
             return pendulum.parse(CONFIG['start_date'])
-    LOGGER.info("found current bookmark for %s:  %s", tap_stream_id, current_bookmark)
+    if log:
+        LOGGER.info("found current bookmark for %s:  %s", tap_stream_id, current_bookmark)
     return pendulum.parse(current_bookmark)
 
+def get_poll_interval(elapsed, percent_complete, expected_duration, min_seconds, max_seconds):
+    """
+    Returns how long to wait before polling an insights job again. The remaining
+    time is extrapolated from the progress reported so far, or taken from the
+    expected duration of the job while Facebook reports no progress. Once a
+    job runs past its expected duration the polls back off with the elapsed
+    time. Only half of it is slept so the polls close in on the completion of
+    the job.
+    """
+    if percent_complete > 0:
+        remaining = elapsed * (100 - percent_complete) / percent_complete
+    elif expected_duration:
+        remaining = max(expected_duration - elapsed, elapsed)
+    else:
+        remaining = elapsed
+    return min(max(remaining / 2, min_seconds), max_seconds)
+
+class InsightsJobHistory():
+    """
+    Telemetry of the insights jobs run by previous syncs, one JSON object per
+    line in `path`. Only the last INSIGHTS_JOB_HISTORY_SIZE jobs are kept.
+    Each entry holds the shape of the job (stream, level, breakdowns, action
+    breakdowns, attribution windows, number of fields and days) along with its
+    duration, number of polls, outcome and number of rows.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = deque(maxlen=INSIGHTS_JOB_HISTORY_SIZE)
+        if os.path.exists(path):
+            line_count = 0
+            with open(path) as history_file:
+                for line in history_file:
+                    line_count += 1
+                    try:
+                        self.entries.append(json.loads(line))
+                    except ValueError:
+                        LOGGER.warning('Skipping invalid insights job history line in %s', path)
+            if line_count > 2 * INSIGHTS_JOB_HISTORY_SIZE:
+                self.compact()
+
+    def compact(self):
+        with open(self.path, 'w') as history_file:
+            for entry in self.entries:
+                history_file.write(json.dumps(entry) + '\n')
+
+    def record(self, entry):
+        with self.lock:
+            self.entries.append(entry)
+            with open(self.path, 'a') as history_file:
+                history_file.write(json.dumps(entry) + '\n')
+
+    def matching(self, shape):
+        with self.lock:
+            return [entry for entry in self.entries
+                    if all(entry.get(key) == value for key, value in shape.items())]
+
+    def completed_durations(self, shape):
+        return [entry['duration'] for entry in self.matching(shape)
+                if entry['outcome'] == 'completed']
+
+    def is_reliable(self, shape):
+        """
+        Returns False when most of the last jobs of this shape did not
+        complete, or took more than half of the time they are given.
+        """
+        entries = self.matching(shape)[-INSIGHTS_JOB_HISTORY_WINDOW:]
+        if not entries:
+            return True
+        completed = sorted(entry['duration'] for entry in entries if entry['outcome'] == 'completed')
+        if len(completed) * 2 < len(entries):
+            return False
+        return completed[len(completed) // 2] <= INSIGHTS_MAX_WAIT_TO_FINISH_SECONDS / 2
+
+JOB_HISTORY = None
+
+def get_job_history():
+    """
+    Returns the job history stored at `insights_job_history_path`, or None when
+    the history is not kept.
+    """
+    global JOB_HISTORY
+    path = CONFIG.get('insights_job_history_path')
+    if not path:
+        return None
+    if JOB_HISTORY is None or JOB_HISTORY.path != path:
+        JOB_HISTORY = InsightsJobHistory(path)
+    return JOB_HISTORY
+
 def advance_bookmark(stream, bookmark_key, date):
     tap_stream_id = stream.name
     state = stream.state or {}
-    LOGGER.info('advance(%s, %s)', tap_stream_id, date)
+    # Called for every recordset and insights job, so nothing is logged at INFO level
+    LOGGER.debug('advance(%s, %s)', tap_stream_id, date)
     date = pendulum.parse(date) if date else None
-    current_bookmark = get_start(stream, bookmark_key)
+    current_bookmark = get_start(stream, bookmark_key, log=False)
 
     if date is None:
-        LOGGER.info('Did not get a date for stream %s '+
-                    ' not advancing bookmark',
-                    tap_stream_id)
+        LOGGER.debug('Did not get a date for stream %s '+
+                     ' not advancing bookmark',
+                     tap_stream_id)
     elif not current_bookmark or date > current_bookmark:
-        LOGGER.info('Bookmark for stream %s is currently %s, ' +
-                    'advancing to %s',
-                    tap_stream_id, current_bookmark, date)
+        LOGGER.debug('Bookmark for stream %s is currently %s, ' +
+                     'advancing to %s',
+                     tap_stream_id, current_bookmark, date)
         state = singer.write_bookmark(state, tap_stream_id, bookmark_key, date.isoformat())
     else:
-        LOGGER.info('Bookmark for stream %s is currently %s ' +
-                    'not changing to %s',
-                    tap_stream_id, current_bookmark, date)
+        LOGGER.debug('Bookmark for stream %s is currently %s ' +
+                     'not changing to %s',
+                     tap_stream_id, current_bookmark, date)
     return state
 
 @attr.s
@@ -677,6 +1453,27 @@ class AdsInsights(Stream):
             if self.buffer_days not in [1, 7, 28]:
                 raise Exception("The attribution window must be 1, 7 or 28.")
 
+        # Number of async report runs kept in flight at once, 1 keeps the jobs serial
+        self.max_concurrent_jobs = int(CONFIG.get('insights_max_concurrent_jobs') or 1)
+        if self.max_concurrent_jobs < 1:
+            raise Exception("insights_max_concurrent_jobs must be a positive integer.")
+        # Number of days packed into the time_ranges of a single report run
+        self.days_per_job = int(CONFIG.get('insights_days_per_job') or 1)
+        if self.days_per_job < 1:
+            raise Exception("insights_days_per_job must be a positive integer.")
+        # Bounds of the interval between two polls of an insights job
+        self.min_poll_seconds = float(CONFIG.get('insights_poll_min_seconds') or INSIGHTS_MIN_ASYNC_SLEEP_SECONDS)
+        self.max_poll_seconds = float(CONFIG.get('insights_poll_max_seconds') or INSIGHTS_MAX_ASYNC_SLEEP_SECONDS)
+        # Durations of the completed jobs of this stream, by number of days in the job
+        self.job_durations = {}
+        # Telemetry of previous syncs, and of the completed jobs whose rows are not read yet
+        self.job_history = get_job_history()
+        self.pending_job_telemetry = {}
+        # Set when the stream stops consuming jobs so background polls give up early
+        self.abandon_jobs = threading.Event()
+        # Rows per page when reading the results of a job, 0 reads pages of RESULT_RETURN_LIMIT rows
+        self.result_page_size = int(CONFIG.get('insights_result_page_size') or 0)
+
     def job_params(self):
         start_date = get_start(self, self.bookmark_key)
 
@@ -701,20 +1498,27 @@ class AdsInsights(Stream):
         if CONFIG.get('end_date'):
             end_date = pendulum.parse(CONFIG.get('end_date'))
 
+        fields = list(self.fields().difference(self.invalid_insights_fields))
+        days_per_job = self.tuned_days_per_job(len(fields))
+
         # Some automatic fields (primary-keys) cannot be used as 'fields' query params.
         while buffered_start_date <= end_date:
+            # Each day keeps its own time range so results are still split per day
+            time_ranges = []
+            while buffered_start_date <= end_date and len(time_ranges) < days_per_job:
+                time_ranges.append({'since': buffered_start_date.to_date_string(),
+                                    'until': buffered_start_date.to_date_string()})
+                buffered_start_date = buffered_start_date.add(days=1)
             yield {
                 'level': self.level,
                 'action_breakdowns': list(self.action_breakdowns),
                 'breakdowns': list(self.breakdowns),
                 'limit': self.limit,
-                'fields': list(self.fields().difference(self.invalid_insights_fields)),
+                'fields': fields,
                 'time_increment': self.time_increment,
                 'action_attribution_windows': list(self.action_attribution_windows),
-                'time_ranges': [{'since': buffered_start_date.to_date_string(),
-                                 'until': buffered_start_date.to_date_string()}]
+                'time_ranges': time_ranges
             }
-            buffered_start_date = buffered_start_date.add(days=1)
 
     @staticmethod
     @retry_pattern(backoff.constant, FacebookRequestError, max_tries=5, interval=1)
@@ -726,16 +1530,44 @@ class AdsInsights(Stream):
     # Added retry_pattern to handle AttributeError raised from requests call below
     @retry_pattern(backoff.expo, (FacebookRequestError, InsightsJobTimeout, FacebookBadObjectError, TypeError, AttributeError), max_tries=5, factor=5)
     def run_job(self, params):
+        return self._run_job(params)
+
+    @retry_pattern(backoff.expo, (Timeout, ConnectionError), max_tries=5, factor=2)
+    # Requesting the same days again is not retried when Facebook asks to reduce the data, the job is split instead
+    @retry_pattern(backoff.expo, (FacebookRequestError, FacebookBadObjectError, TypeError, AttributeError),
+                   give_up=is_reduce_data_error, max_tries=5, factor=5)
+    def run_multi_day_job(self, params):
+        """
+        Runs a job spanning several days, retrying transient and throttling
+        errors like `run_job` does. Failures a smaller job may avoid are
+        raised to be split instead of retried.
+        """
+        return self._run_job(params)
+
+    def _run_job(self, params):
+        telemetry = {'polls': 0, 'outcome': 'error'}
+        time_start = time.time()
+        try:
+            return self._wait_for_job(params, telemetry)
+        except Exception:
+            # Only report runs that were created say something about the shape of the job
+            if 'days' in telemetry and telemetry['outcome'] != 'abandoned':
+                self.record_job(telemetry, time.time() - time_start)
+            raise
+
+    def _wait_for_job(self, params, telemetry):
         LOGGER.info('Starting adsinsights job with params %s', params)
         job = self.account.get_insights( # pylint: disable=no-member
             params=params,
             is_async=True)
+        telemetry.update(self.job_shape(params))
         status = None
         time_start = time.time()
-        sleep_time = 10
+        expected_duration = self.expected_job_duration(params)
         while status != "Job Completed":
             duration = time.time() - time_start
             job = AdsInsights.__api_get_with_retry(job)
+            telemetry['polls'] += 1
             status = job['async_status']
             percent_complete = job['async_percent_completion']
 
@@ -743,15 +1575,20 @@ class AdsInsights(Stream):
             LOGGER.info('%s, %d%% done', status, percent_complete)
 
             if status == "Job Completed":
+                telemetry['outcome'] = 'completed'
+                telemetry['duration'] = time.time() - time_start
+                self.job_durations.setdefault(telemetry['days'], []).append(telemetry['duration'])
+                self.pending_job_telemetry[id(job)] = telemetry
                 return job
 
             if status == "Job Failed":
+                telemetry['outcome'] = 'failed'
                 error_code = job.get('error_code')
                 error_message = job.get('error_message')
                 error_subcode = job.get('error_subcode')
                 error_user_title = job.get('error_user_title')
                 error_user_msg = job.get('error_user_msg')
-                raise TapFacebookException(
+                raise InsightsJobFailed(
                     'Insights job {} failed. error_code={}, error_subcode={}, '
                     'error_user_title={}, error_user_msg={}, error_message={}'.format(
                         job_id, error_code, error_subcode,
@@ -762,29 +1599,139 @@ class AdsInsights(Stream):
                                         'This is an intermittent error and may resolve itself on subsequent queries to the Facebook API. ' +
                                         'You should deselect fields from the schema that are not necessary, ' +
                                         'as that may help improve the reliability of the Facebook API.')
+                telemetry['outcome'] = 'timeout'
                 raise InsightsJobTimeout(pretty_error_message.format(job_id, INSIGHTS_MAX_WAIT_TO_START_SECONDS))
             elif duration > INSIGHTS_MAX_WAIT_TO_FINISH_SECONDS and status != "Job Completed":
                 pretty_error_message = ('Insights job {} did not complete after {} seconds. ' +
                                         'This is an intermittent error and may resolve itself on subsequent queries to the Facebook API. ' +
                                         'You should deselect fields from the schema that are not necessary, ' +
                                         'as that may help improve the reliability of the Facebook API.')
+                telemetry['outcome'] = 'timeout'
                 raise InsightsJobTimeout(pretty_error_message.format(job_id,
                                                                      INSIGHTS_MAX_WAIT_TO_FINISH_SECONDS//60))
 
+            sleep_time = get_poll_interval(duration, percent_complete, expected_duration,
+                                           self.min_poll_seconds, self.max_poll_seconds)
             LOGGER.info("sleeping for %d seconds until job is done", sleep_time)
             time.sleep(sleep_time)
-            if sleep_time < INSIGHTS_MAX_ASYNC_SLEEP_SECONDS:
-                sleep_time = 2 * sleep_time
+            if self.abandon_jobs.is_set() or self.stopped():
+                telemetry['outcome'] = 'abandoned'
+                raise TapFacebookException('Insights job {} abandoned as the sync stopped'.format(job_id))
         return job
 
-    def __iter__(self):
-        for params in self.job_params():
+    def expected_job_duration(self, params):
+        """
+        Returns the median duration of the previous jobs of this stream that
+        covered as many days as `params`, or None before any of them completed.
+        The jobs of previous syncs with the same shape are used until a job of
+        this sync completes.
+        """
+        durations = self.job_durations.get(len(params.get('time_ranges', [])))
+        if not durations and self.job_history:
+            durations = self.job_history.completed_durations(self.job_shape(params))
+        if not durations:
+            return None
+        return sorted(durations)[len(durations) // 2]
+
+    def job_shape(self, params):
+        return {'stream': self.name,
+                'level': self.level,
+                'breakdowns': list(self.breakdowns),
+                'action_breakdowns': list(self.action_breakdowns),
+                'action_attribution_windows': list(self.action_attribution_windows),
+                'fields': len(params.get('fields', [])),
+                'days': len(params.get('time_ranges', []))}
+
+    def record_job(self, telemetry, duration, rows=None):
+        if self.job_history:
+            self.job_history.record(dict(telemetry, duration=round(duration, 1), rows=rows))
+
+    def tuned_days_per_job(self, field_count):
+        """
+        Returns the number of days to pack in a job, halving
+        `insights_days_per_job` while the job history shows that jobs of that
+        size mostly fail or run close to their timeout.
+        """
+        days_per_job = self.days_per_job
+        while days_per_job > 1 and self.job_history:
+            shape = self.job_shape({'fields': [None] * field_count, 'time_ranges': [None] * days_per_job})
+            if self.job_history.is_reliable(shape):
+                break
+            days_per_job //= 2
+        if days_per_job != self.days_per_job:
+            LOGGER.info('%s: previous insights jobs of %d days were unreliable, packing %d days per job',
+                        self.name, self.days_per_job, days_per_job)
+        return days_per_job
+
+    def run_jobs(self, params):
+        """
+        Runs the report run for `params` and returns its (params, job) pairs in
+        date order. A job spanning several days is split in half when Facebook
+        fails it, times out or asks to reduce the amount of data, down to
+        single days which get the usual retries.
+        """
+        time_ranges = params['time_ranges']
+        if len(time_ranges) == 1:
             with metrics.job_timer('insights'):
-                job = self.run_job(params)
+                return [(params, self.run_job(params))]
+
+        try:
+            with metrics.job_timer('insights'):
+                return [(params, self.run_multi_day_job(params))]
+        except (InsightsJobFailed, InsightsJobTimeout, FacebookRequestError) as ex:
+            if self.abandon_jobs.is_set() or self.stopped() or (isinstance(ex, FacebookRequestError) and not is_reduce_data_error(ex)):
+                raise
+            LOGGER.warning('Insights job for %s to %s failed, splitting it into two jobs: %s',
+                           time_ranges[0]['since'], time_ranges[-1]['until'], ex)
+            middle = len(time_ranges) // 2
+            return (self.run_jobs(dict(params, time_ranges=time_ranges[:middle]))
+                    + self.run_jobs(dict(params, time_ranges=time_ranges[middle:])))
+
+    def get_job_result(self, job):
+        """
+        Returns the rows of a completed job, read in pages of the stream's
+        page size. With `insights_result_page_size` the pages have that size
+        and the next pages are downloaded on a background thread while the
+        rows are processed.
+        """
+        rows = partial(iter_pages, job.get_result, {}, self.page_size())
+        if not self.result_page_size:
+            return rows()
+        return iter_concurrently([rows], 1)
+
+    def default_page_size(self):
+        return self.result_page_size or RESULT_RETURN_LIMIT
+
+    def iter_jobs(self):
+        """
+        Yields (params, job) pairs for every completed report run in the order
+        of `job_params`, keeping up to `max_concurrent_jobs` runs in flight so
+        records and bookmarks are still emitted in date order.
+        """
+        if self.max_concurrent_jobs == 1:
+            for params in self.job_params():
+                yield from self.run_jobs(params)
+            return
+
+        self.abandon_jobs.clear()
+        in_flight = deque()
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent_jobs)
+        try:
+            for params in self.job_params():
+                in_flight.append(submit_in_context(executor, self.run_jobs, params))
+                if len(in_flight) >= self.max_concurrent_jobs:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+        finally:
+            self.abandon_jobs.set()
+            executor.shutdown(wait=False, cancel_futures=True)
 
+    def __iter__(self):
+        for params, job in self.iter_jobs():
             min_date_start_for_job = None
             count = 0
-            for obj in job.get_result():
+            for obj in self.get_job_result(job):
                 count += 1
                 rec = obj.export_all_data()
                 if not min_date_start_for_job or rec['date_stop'] < min_date_start_for_job:
@@ -798,10 +1745,15 @@ class AdsInsights(Stream):
 
                 yield {'record': rec}
             LOGGER.info('Got %d results for insights job', count)
+            telemetry = self.pending_job_telemetry.pop(id(job), None)
+            if telemetry:
+                self.record_job(telemetry, telemetry['duration'], rows=count)
 
             # when min_date_start_for_job stays None, we should
-            # still update the bookmark using 'until' in time_ranges
-            if min_date_start_for_job is None:
+            # still update the bookmark using 'until' in time_ranges.
+            # A job spanning several days has synced all of them, so
+            # its bookmark also moves to the end of the last time range
+            if min_date_start_for_job is None or len(params['time_ranges']) > 1:
                 for time_range in params['time_ranges']:
                     if time_range['until']:
                         min_date_start_for_job = time_range['until']
@@ -855,7 +1807,7 @@ def initialize_stream(account, catalog_entry, state): # pylint: disable=too-many
     elif name == 'ads':
         return Ads(name, account, stream_alias, catalog_entry, state=state)
     elif name == 'adcreative':
-        return AdCreative(name, account, stream_alias, catalog_entry)
+        return AdCreative(name, account, stream_alias, catalog_entry, state=state)
     elif name == 'leads':
         return Leads(name, account, stream_alias, catalog_entry, state=state)
     else:
@@ -884,42 +1836,478 @@ def transform_date_hook(data, typ, schema):
         return transformed
     return data
 
-def do_sync(account, catalog, state):
+def compile_schema(schema, removed, path=()):
+    """
+    Returns a function applying `schema` to a value the way singer's Transformer
+    does with transform_date_hook, returning a (success, value) pair. Every
+    schema lookup is done once here instead of for every value.
+    """
+    if 'anyOf' in schema:
+        return compile_first_success([compile_schema(subschema, removed, path)
+                                      for subschema in schema['anyOf']])
+    if 'type' not in schema:
+        return lambda value: (True, value)
+
+    types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+    # null is always tried last
+    types = [typ for typ in types if typ != 'null'] + [typ for typ in types if typ == 'null']
+    return compile_first_success([compile_type(typ, schema, removed, path) for typ in types])
+
+def compile_first_success(converters):
+    if len(converters) == 1:
+        return converters[0]
+
+    def convert(value):
+        for converter in converters:
+            success, result = converter(value)
+            if success:
+                return True, result
+        return False, None
+    return convert
+
+def compile_type(typ, schema, removed, path): # pylint: disable=too-many-return-statements
+    if typ == 'null':
+        return lambda value: (True, None) if value is None or value == '' else (False, None)
+    if typ == 'string' and schema.get('format') == 'date-time':
+        return convert_datetime
+    if typ == 'string' and schema.get('format') != 'singer.decimal':
+        return lambda value: (False, None) if value is None else (True, str(value))
+    if typ == 'integer':
+        return partial(convert_number, int)
+    if typ == 'number':
+        return partial(convert_number, float)
+    if typ == 'boolean':
+        return convert_boolean
+    if typ == 'object':
+        return compile_object(schema.get('properties', {}), schema.get('patternProperties'), removed, path)
+    if typ == 'array':
+        convert_item = compile_schema(schema['items'], removed, path)
+        def convert_array(value):
+            if not isinstance(value, list):
+                return False, None
+            result = []
+            for item in value:
+                success, converted = convert_item(item)
+                if not success:
+                    return False, None
+                result.append(converted)
+            return True, result
+        return convert_array
+
+    # Other formats keep singer's own conversion
+    transformer = Transformer(pre_hook=transform_date_hook)
+    return lambda value: transformer._transform(value, typ, schema, list(path)) # pylint: disable=protected-access
+
+def compile_object(properties, pattern_properties, removed, path):
+    if not properties and not pattern_properties:
+        return lambda value: (True, value) if isinstance(value, dict) else (False, None)
+
+    property_converters = {key: compile_schema(subschema, removed, path + (key,))
+                           for key, subschema in properties.items()}
+    pattern_converters = [(re.compile(pattern), compile_schema(subschema, removed, path))
+                          for pattern, subschema in (pattern_properties or {}).items()]
+
+    def convert_object(value):
+        if not isinstance(value, dict):
+            return False, None
+        result = {}
+        for key, item in value.items():
+            converter = property_converters.get(key)
+            if converter is None:
+                matching = [converter for pattern, converter in pattern_converters if pattern.match(key)]
+                if not matching:
+                    removed.add('.'.join(map(str, path + (key,))))
+                    continue
+                converter = compile_first_success(matching)
+            success, result[key] = converter(item)
+            if not success:
+                return False, None
+        return True, result
+    return convert_object
+
+def convert_datetime(value):
+    if isinstance(value, str):
+        # transform_datetime_string already returns the format singer writes
+        return True, transform_datetime_string(value)
+    if value is None:
+        return False, None
+    value = string_to_datetime(value)
+    return value is not None, value
+
+def convert_number(number_type, value):
+    if isinstance(value, str):
+        value = value.replace(',', '')
+    try:
+        return True, number_type(value)
+    except Exception: # pylint: disable=broad-except
+        return False, None
+
+def convert_boolean(value):
+    if isinstance(value, str) and value.lower() == 'false':
+        return True, False
+    return True, bool(value)
+
+class RecordTransformer():
+    """
+    Drop-in replacement of singer's Transformer with transform_date_hook that
+    compiles the schema and the metadata filter of a stream once, then
+    transforms every record with them. A record that does not match the schema
+    is handed to singer's Transformer to raise its usual SchemaMismatch.
+    """
+    def __init__(self):
+        self.removed = set()
+        self.compiled = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        if self.removed:
+            LOGGER.debug("Removed %s paths during transforms:\n\t%s",
+                         len(self.removed), "\n\t".join(sorted(self.removed)))
+
+    def compile(self, schema, metadata_map):
+        # Fields that are not selected or unsupported are dropped from the record,
+        # nested fields marked that way need singer's recursive filter
+        dropped_fields = set()
+        filter_nested = False
+        for breadcrumb, data in (metadata_map or {}).items():
+            if data.get('inclusion') == 'automatic':
+                continue
+            if data.get('selected') is False or data.get('inclusion') == 'unsupported':
+                if len(breadcrumb) == 2:
+                    dropped_fields.add(breadcrumb[1])
+                elif len(breadcrumb) > 2:
+                    filter_nested = True
+        return (schema, metadata_map, frozenset(dropped_fields), filter_nested,
+                compile_schema(schema, self.removed))
+
+    def transform(self, data, schema, metadata=None):
+        if self.compiled is None or self.compiled[0] is not schema or self.compiled[1] is not metadata:
+            self.compiled = self.compile(schema, metadata)
+        _, _, dropped_fields, filter_nested, convert = self.compiled
+
+        record = data
+        if filter_nested:
+            record = Transformer().filter_data_by_metadata(copy.deepcopy(data), metadata)
+        elif dropped_fields and isinstance(data, dict):
+            record = {key: value for key, value in data.items() if key not in dropped_fields}
+
+        success, transformed = convert(record)
+        if success:
+            return transformed
+        return Transformer(pre_hook=transform_date_hook).transform(data, schema, metadata=metadata)
+
+class MessageWriter():
+    """
+    Writes the Singer messages of the synced streams. Records are serialized
+    with the standard library encoder and written to stdout in chunks, once
+    OUTPUT_BUFFER_SIZE characters are buffered or OUTPUT_FLUSH_SECONDS have
+    passed, and always before any other message so a bookmark is never
+    emitted ahead of its records. STATE messages are handed to `write_state`,
+    which emits the state of the whole sync. With `state_checkpoint_records`
+    or `state_checkpoint_seconds` only the latest state is emitted once that
+    many records or seconds went by since the previous one, and at the end of
+    every stream. Once the `stop` event is set nothing more is written and
+    ConsumerStopped is raised to the stream writing.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=True, allow_nan=False)
+
+    def __init__(self, write_state=None, stop=None):
+        self.state_writer = write_state or singer.write_state
+        self.stop = stop
+        self.buffer = []
+        self.buffer_size = 0
+        self.last_flush = time.monotonic()
+        self.checkpoint_records = int(CONFIG.get('state_checkpoint_records') or 0)
+        self.checkpoint_seconds = float(CONFIG.get('state_checkpoint_seconds') or 0)
+        self.pending_state = None
+        self.records_since_state = 0
+        self.last_state = time.monotonic()
+
+    def stopped(self):
+        return self.stop is not None and self.stop.is_set()
+
+    def write_schema(self, stream, schema):
+        self.flush()
+        singer.write_schema(stream.name, schema, stream.key_properties,
+                            BOOKMARK_KEYS.get(stream.name), stream.stream_alias)
+
+    def write_record(self, stream, record, time_extracted=None):
+        if self.stopped():
+            raise ConsumerStopped()
+        message = {'type': 'RECORD', 'stream': stream.stream_alias or stream.name, 'record': record}
+        if time_extracted:
+            message['time_extracted'] = singer.strftime(time_extracted.astimezone(timezone.utc))
+        try:
+            line = self.encoder.encode(message)
+        except (TypeError, ValueError):
+            # Decimals are only written by singer's encoder, which also raises for NaN
+            line = singer.format_message(singer.RecordMessage(stream=message['stream'], record=record,
+                                                              time_extracted=time_extracted))
+        self.buffer.append(line + '\n')
+        self.buffer_size += len(line) + 1
+        self.records_since_state += 1
+        if (self.buffer_size >= OUTPUT_BUFFER_SIZE
+                or time.monotonic() - self.last_flush >= OUTPUT_FLUSH_SECONDS):
+            self.flush()
+
+    def write_state(self, stream, state):
+        # Streams only hand over states covering the records they already wrote
+        self.pending_state = state
+        coalesce = self.checkpoint_records or self.checkpoint_seconds
+        if (not coalesce
+                or (self.checkpoint_records and self.records_since_state >= self.checkpoint_records)
+                or (self.checkpoint_seconds and time.monotonic() - self.last_state >= self.checkpoint_seconds)):
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Writes the buffered records, then the latest state if one is pending."""
+        self.flush()
+        if self.pending_state is not None:
+            self.state_writer(self.pending_state)
+            self.pending_state = None
+            self.records_since_state = 0
+            self.last_state = time.monotonic()
+
+    def flush(self):
+        if self.stopped():
+            # Records of a stopped sync are dropped along with their pending state
+            self.buffer = []
+            self.pending_state = None
+            raise ConsumerStopped()
+        if self.buffer:
+            sys.stdout.write(''.join(self.buffer))
+            sys.stdout.flush()
+            self.buffer = []
+            self.buffer_size = 0
+        self.last_flush = time.monotonic()
+
+class EmittingWriter():
+    """
+    Stands in for the MessageWriter of a stream synced on a background thread,
+    emitting its messages in order to the thread that owns the writer.
+    """
+    def __init__(self, emit):
+        self.emit = emit
+
+    def write_schema(self, stream, schema):
+        self.emit(('schema', stream, schema))
+
+    def write_record(self, stream, record, time_extracted=None):
+        self.emit(('record', stream, record, time_extracted))
+
+    def write_state(self, stream, state):
+        # The stream keeps advancing its state while the message waits to be written
+        self.emit(('state', stream, copy.deepcopy(state)))
+
+    def checkpoint(self):
+        self.emit(('checkpoint', None))
+
+    def flush(self):
+        # Messages are emitted as they are written, the owning writer flushes them on checkpoint
+        pass
+
+def sync_stream(stream, writer):
+    LOGGER.info('Syncing %s, fields %s', stream.name, stream.fields())
+    schema = SCHEMAS.schema(stream)
+    metadata_map = SCHEMAS.metadata_map(stream.catalog_entry)
+    writer.write_schema(stream, schema)
+
+    # NB: The AdCreative stream is not an iterator
+    if stream.name in {'adcreative', 'leads'}:
+        stream.sync(writer)
+        writer.checkpoint()
+        return
+
+    with RecordTransformer() as transformer:
+        with metrics.record_counter(stream.name) as counter:
+            for message in stream:
+                if 'record' in message:
+                    counter.increment()
+                    time_extracted = utils.now()
+                    record = transformer.transform(message['record'], schema, metadata=metadata_map)
+                    writer.write_record(stream, record, time_extracted)
+                elif 'state' in message:
+                    writer.write_state(stream, message['state'])
+                else:
+                    raise TapFacebookException('Unrecognized message {}'.format(message))
+    writer.checkpoint()
+
+def sync_streams_concurrently(streams, state, writer, max_workers):
+    """
+    Syncs up to `max_workers` streams at once on background threads while
+    their messages are written in order from this thread. Every stream
+    advances its own copy of the state, and its bookmarks are merged into the
+    written state once the records before them are written. Once a stream
+    fails, the others stop at their next write or insights poll.
+    """
+    stop = threading.Event()
+    for stream in streams:
+        if getattr(stream, 'state', None) is not None:
+            stream.state = copy.deepcopy(stream.state)
+        stream.stop_events += (stop,)
+    merged_state = copy.deepcopy(state or {})
+
+    def sync(stream, emit):
+        sync_stream(stream, EmittingWriter(emit))
+
+    tasks = [partial(sync, stream) for stream in streams]
+    for message_type, stream, *args in iter_emitted(tasks, max_workers, stop):
+        if message_type == 'schema':
+            writer.write_schema(stream, *args)
+        elif message_type == 'record':
+            writer.write_record(stream, *args)
+        elif message_type == 'checkpoint':
+            writer.checkpoint()
+        else:
+            bookmarks = args[0].get('bookmarks', {})
+            if stream.name in bookmarks:
+                merged_state.setdefault('bookmarks', {})[stream.name] = bookmarks[stream.name]
+            writer.write_state(stream, merged_state)
+
+def do_sync(account, catalog, state, write_state=None, stop=None):
+    if sync_account(account, catalog, state, write_state, stop):
+        raise_dma_deprecated()
+
+def sync_account(account, catalog, state, write_state=None, stop=None):
+    """
+    Syncs the selected streams of an account, stopping once the `stop` event
+    is set. Returns whether the deprecated DMA stream was selected.
+    """
+    # Requests that do not name the account are paced on its usage
+    ACCOUNT_ID.set(account['account_id'])
+    writer = MessageWriter(write_state, stop)
     streams_to_sync, dma_selected = get_streams_to_sync(account, catalog, state)
-    refs = load_shared_schema_refs()
     for stream in streams_to_sync:
-        LOGGER.info('Syncing %s, fields %s', stream.name, stream.fields())
-        schema = singer.resolve_schema_references(load_schema(stream), refs)
-        metadata_map = metadata.to_map(stream.catalog_entry.metadata)
-        bookmark_key = BOOKMARK_KEYS.get(stream.name)
-        singer.write_schema(stream.name, schema, stream.key_properties, bookmark_key, stream.stream_alias)
+        stream.stop_events = (stop,) if stop is not None else ()
+    max_concurrent_streams = int(CONFIG.get('max_concurrent_streams') or 1)
+    try:
+        if max_concurrent_streams > 1 and len(streams_to_sync) > 1:
+            sync_streams_concurrently(streams_to_sync, state, writer, max_concurrent_streams)
+        else:
+            for stream in streams_to_sync:
+                sync_stream(stream, writer)
+    finally:
+        # A pending state only covers records already handed to the writer
+        if not writer.stopped():
+            writer.checkpoint()
+    return dma_selected
+
+def raise_dma_deprecated():
+    raise TapFacebookException(
+        "The 'ads_insights_dma' stream is no longer supported. "
+        "Meta removed DMA breakdown support on June 22, 2026. "
+        "Please deselect 'ads_insights_dma' and use 'ads_insights_comscore_market' instead. "
+        "See https://www.facebook.com/business/help/709868688063859 for DMA to Comscore Market mapping."
+    )
+
 
+def do_sync_accounts(accounts, catalog, state):
+    """
+    Syncs several accounts in this process, up to `max_concurrent_accounts` at
+    once. The bookmarks of every account are kept under
+    state['accounts'][account_id], and the bookmarks of a single account state
+    are used for the first account until it has its own. When an account
+    fails the other accounts are stopped before its error is raised.
+    """
+    state = state or {}
+    root_state = {'accounts': copy.deepcopy(state.get('accounts', {}))}
+    first_account_id = accounts[0]['account_id']
+    if state.get('bookmarks') and first_account_id not in root_state['accounts']:
+        root_state['accounts'][first_account_id] = {'bookmarks': copy.deepcopy(state['bookmarks'])}
+
+    state_lock = threading.Lock()
+    def write_account_state(account_id, account_state):
+        with state_lock:
+            root_state['accounts'][account_id] = copy.deepcopy(account_state)
+            singer.write_state(root_state)
+
+    stop = threading.Event()
+    def sync_or_stop(account, account_state):
+        # Stops in the failing worker, before it could start a queued account
+        if stop.is_set():
+            return False
+        try:
+            return sync_account(account, catalog, account_state,
+                                partial(write_account_state, account['account_id']), stop)
+        except ConsumerStopped:
+            # Stopped by the failure of another account, whose error is the one raised
+            return False
+        except BaseException:
+            stop.set()
+            raise
+
+    syncs = []
+    for account in accounts:
+        account_state = copy.deepcopy(root_state['accounts'].get(account['account_id'], {}))
+        syncs.append(partial(sync_or_stop, account, account_state))
+
+    max_concurrent_accounts = int(CONFIG.get('max_concurrent_accounts') or 1)
+    executor = ThreadPoolExecutor(max_workers=max_concurrent_accounts)
+    dma_selected = False
+    try:
+        for future in as_completed([executor.submit(sync) for sync in syncs]):
+            dma_selected = future.result() or dma_selected
+    finally:
+        stop.set()
+        # Running accounts stop at their next write or insights poll, none writes after this returns
+        executor.shutdown(wait=True, cancel_futures=True)
+    if dma_selected:
+        raise_dma_deprecated()
 
-        # NB: The AdCreative stream is not an iterator
-        if stream.name in {'adcreative', 'leads'}:
-            stream.sync()
+
+def get_account_ids(config):
+    """
+    Returns `account_id` followed by the ids listed in `account_ids`, a list or
+    a comma separated string.
+    """
+    account_ids = [config['account_id']]
+    extra_account_ids = config.get('account_ids') or []
+    if isinstance(extra_account_ids, str):
+        extra_account_ids = extra_account_ids.split(',')
+    for account_id in extra_account_ids:
+        account_id = str(account_id).strip()
+        if account_id and account_id not in account_ids:
+            account_ids.append(account_id)
+    return account_ids
+
+
+def get_accounts(account_ids):
+    """
+    Returns the ad accounts of `account_ids`, each read directly from its
+    act_<id> node. Accounts that cannot be read that way are looked for in a
+    single listing of the user's ad accounts. An account missing from the
+    listing too fails with the error of its direct read, or as not found when
+    it was read but belongs to another id.
+    """
+    accounts_by_id = {}
+    read_errors = {}
+    for account_id in account_ids:
+        try:
+            account = fb_adaccount.AdAccount('act_{}'.format(account_id)).api_get(fields=['account_id'])
+        except (FacebookError, Timeout, ConnectionError) as fb_error:
+            LOGGER.warning("Couldn't read account act_%s directly, looking for it in the user's ad accounts: %s",
+                           account_id, fb_error)
+            read_errors[account_id] = fb_error
             continue
+        if account['account_id'] == account_id:
+            accounts_by_id[account_id] = account
 
-        with Transformer(pre_hook=transform_date_hook) as transformer:
-            with metrics.record_counter(stream.name) as counter:
-                for message in stream:
-                    if 'record' in message:
-                        counter.increment()
-                        time_extracted = utils.now()
-                        record = transformer.transform(message['record'], schema, metadata=metadata_map)
-                        singer.write_record(stream.name, record, stream.stream_alias, time_extracted)
-                    elif 'state' in message:
-                        singer.write_state(message['state'])
-                    else:
-                        raise TapFacebookException('Unrecognized message {}'.format(message))
+    missing_account_ids = [account_id for account_id in account_ids if account_id not in accounts_by_id]
+    if missing_account_ids:
+        user = fb_user.User(fbid='me')
+        for acc in user.get_ad_accounts():
+            if acc['account_id'] in missing_account_ids:
+                accounts_by_id[acc['account_id']] = acc
 
-    if dma_selected:
-        raise TapFacebookException(
-            "The 'ads_insights_dma' stream is no longer supported. "
-            "Meta removed DMA breakdown support on June 22, 2026. "
-            "Please deselect 'ads_insights_dma' and use 'ads_insights_comscore_market' instead. "
-            "See https://www.facebook.com/business/help/709868688063859 for DMA to Comscore Market mapping."
-        )
+    for account_id in account_ids:
+        if account_id in accounts_by_id:
+            continue
+        if account_id in read_errors:
+            raise_from(SingerConfigurationError, read_errors[account_id])
+        raise SingerConfigurationError("Couldn't find account with id {}".format(account_id))
+    return [accounts_by_id[account_id] for account_id in account_ids]
 
 
 def get_abs_path(path):
@@ -940,16 +2328,13 @@ def initialize_streams_for_discovery(): # pylint: disable=invalid-name
     return [s for s in streams if s is not None]
 
 def discover_schemas():
-    # Load Facebook's shared schemas
-    refs = load_shared_schema_refs()
-
     result = {'streams': []}
     streams = initialize_streams_for_discovery()
     for stream in streams:
         if stream is None:
             continue
         LOGGER.info('Loading schema for %s', stream.name)
-        schema = singer.resolve_schema_references(load_schema(stream), refs)
+        schema = SCHEMAS.schema(stream)
 
         bookmark_key = BOOKMARK_KEYS.get(stream.name)
 
@@ -980,6 +2365,51 @@ def load_shared_schema_refs():
 
     return shared_schema_refs
 
+class SchemaRegistry():
+    """
+    Process-wide cache of the Facebook shared schemas, the resolved schema of
+    every stream and catalog entry, and the metadata maps of the catalog
+    entries, so discovery, sync and batch retries resolve each of them once.
+    Resolved schemas are shared and must not be modified.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.refs = None
+        self.schemas = {}
+        # Keyed by id of the catalog entry, which is kept so the id is not reused
+        self.catalog_schemas = {}
+        self.metadata_maps = {}
+
+    def shared_refs(self):
+        with self.lock:
+            if self.refs is None:
+                self.refs = load_shared_schema_refs()
+            return self.refs
+
+    def schema(self, stream):
+        """Returns the resolved schema of the schema file of `stream`."""
+        with self.lock:
+            if stream.name not in self.schemas:
+                self.schemas[stream.name] = singer.resolve_schema_references(load_schema(stream),
+                                                                             self.shared_refs())
+            return self.schemas[stream.name]
+
+    def catalog_schema(self, catalog_entry):
+        """Returns the resolved schema of `catalog_entry`."""
+        with self.lock:
+            if id(catalog_entry) not in self.catalog_schemas:
+                schema = singer.resolve_schema_references(catalog_entry.schema.to_dict(), self.shared_refs())
+                self.catalog_schemas[id(catalog_entry)] = (catalog_entry, schema)
+            return self.catalog_schemas[id(catalog_entry)][1]
+
+    def metadata_map(self, catalog_entry):
+        with self.lock:
+            if id(catalog_entry) not in self.metadata_maps:
+                self.metadata_maps[id(catalog_entry)] = (catalog_entry, metadata.to_map(catalog_entry.metadata))
+            return self.metadata_maps[id(catalog_entry)][1]
+
+SCHEMAS = SchemaRegistry()
+
 def do_discover():
     LOGGER.info('Loading schemas')
     json.dump(discover_schemas(), sys.stdout, indent=4)
@@ -988,7 +2418,7 @@ def do_discover():
 def main_impl():
     try:
         args = utils.parse_args(REQUIRED_CONFIG_KEYS)
-        account_id = args.config['account_id']
+        account_ids = get_account_ids(args.config)
         access_token = args.config['access_token']
 
         CONFIG.update(args.config)
@@ -1005,15 +2435,7 @@ def main_impl():
 
         global API
         API = FacebookAdsApi.init(access_token=access_token, timeout=request_timeout)
-        user = fb_user.User(fbid='me')
-
-        accounts = user.get_ad_accounts()
-        account = None
-        for acc in accounts:
-            if acc['account_id'] == account_id:
-                account = acc
-        if not account:
-            raise SingerConfigurationError("Couldn't find account with id {}".format(account_id))
+        accounts = get_accounts(account_ids)
     except FacebookError as fb_error:
         raise_from(SingerConfigurationError, fb_error)
 
@@ -1025,7 +2447,10 @@ def main_impl():
     elif args.properties:
         catalog = Catalog.from_dict(args.properties)
         try:
-            do_sync(account, catalog, args.state)
+            if len(accounts) == 1:
+                do_sync(accounts[0], catalog, args.state)
+            else:
+                do_sync_accounts(accounts, catalog, args.state)
         except FacebookError as fb_error:
             raise_from(SingerSyncError, fb_error)
     else:
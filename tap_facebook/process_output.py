@@ -21,7 +21,14 @@ def load_records():
         yield json.loads(line)
 
 def translate_raw_record(raw):
-    breakdowns = translate_breakdown(raw['table']['breakdowns'])
+    # Lines of the tap's insights_job_history_path describe a single job
+    # instead of a whole experiment run
+    if 'outcome' in raw:
+        raw = {'table': raw,
+               'return_code': 0 if raw['outcome'] == 'completed' else 1,
+               'duration': raw['duration']}
+
+    breakdowns = translate_breakdown(raw['table']['breakdowns'] or None)
 
     return {
         'level': raw['table']['level'],
@@ -47,32 +47,25 @@ class TestAttributErrorBackoff(unittest.TestCase):
         self.assertEqual(mocked_account.get_ads.call_count, 5)
 
     @mock.patch("pendulum.parse")
-    def test_ad_prepare_record(self, mocked_parse, mocked_sleep):
+    def test_ad_iter(self, mocked_parse, mocked_sleep):
         """ 
-            __iter__ of Ads calls a function _iterate which calls a nested prepare_record function.
-            Prepare_record calls a `facebook_business` method,`ad.api_get()`, to get a ad fields. 
-            We mock this method to raise a `AttributeError` and expect the tap to retry this that function up to 5 times,
-            which is the current hard coded `max_tries` value.
+            __iter__ of Ads lists ads with every selected field through `get_ads()`, so no
+            request is made per object. We mock this method to raise a `AttributeError` and expect the tap to
+            retry the listing up to 5 times, which is the current hard coded `max_tries` value.
         """
-        # Mock ad object
-        mocked_ad = Mock()
-        mocked_ad.api_get = Mock()
-        mocked_ad.__getitem__ = Mock()
-        mocked_ad.api_get.side_effect = AttributeError
-
-        # # Mock get_ads function return mocked ad object
+        # Mock get_ads function to throw AttributeError exception
         mocked_account = Mock()
         mocked_account.get_ads = Mock()
-        mocked_account.get_ads.side_effect = [[mocked_ad]]
+        mocked_account.get_ads.side_effect = AttributeError
 
-        # Iterate ads object which calls prepare_record() inside and verify AttributeError is raised
+        # Iterate ad object which lists ads and verify AttributeError is raised
         ad_object = Ads('', mocked_account, '', '', '')
         with self.assertRaises(AttributeError):
             for message in ad_object:
                 pass
 
-        # verify prepare_record() function by checking call count of mocked ad.api_get()
-        self.assertEqual(mocked_ad.api_get.call_count, 5)
+        # verify get_ads() is called 5 times as max 5 reties provided for function
+        self.assertEqual(mocked_account.get_ads.call_count, 5)
 
     def test__call_get_ad_sets(self, mocked_sleep):
         """ 
@@ -95,33 +88,25 @@ class TestAttributErrorBackoff(unittest.TestCase):
         self.assertEqual(mocked_account.get_ad_sets.call_count, 5)
 
     @mock.patch("pendulum.parse")
-    def test_adset_prepare_record(self, mocked_parse, mocked_sleep):
+    def test_adset_iter(self, mocked_parse, mocked_sleep):
         """ 
-            __iter__ of AdSets calls a function _iterate which calls a nested prepare_record function.
-            Prepare_record calls a `facebook_business` method,`ad.api_get()`, to get a ad fields. 
-            We mock this method to raise a `AttributeError` and expect the tap to retry this that function up to 5 times,
-            which is the current hard coded `max_tries` value.
+            __iter__ of AdSets lists adsets with every selected field through `get_ad_sets()`, so no
+            request is made per object. We mock this method to raise a `AttributeError` and expect the tap to
+            retry the listing up to 5 times, which is the current hard coded `max_tries` value.
         """
-
-        # Mock adset object
-        mocked_adset = Mock()
-        mocked_adset.api_get = Mock()
-        mocked_adset.__getitem__ = Mock()
-        mocked_adset.api_get.side_effect = AttributeError
-
-        # Mock get_ad_sets function return mocked ad object
+        # Mock get_ad_sets function to throw AttributeError exception
         mocked_account = Mock()
         mocked_account.get_ad_sets = Mock()
-        mocked_account.get_ad_sets.side_effect = [[mocked_adset]]
+        mocked_account.get_ad_sets.side_effect = AttributeError
 
-        # Iterate adset object which calls prepare_record() inside and verify AttributeError is raised
-        ad_set_object = AdSets('', mocked_account, '', '', '')
+        # Iterate adset object which lists adsets and verify AttributeError is raised
+        adset_object = AdSets('', mocked_account, '', '', '')
         with self.assertRaises(AttributeError):
-            for message in ad_set_object:
+            for message in adset_object:
                 pass
 
-        # verify prepare_record() function by checking call count of mocked ad.api_get()
-        self.assertEqual(mocked_adset.api_get.call_count, 5)
+        # verify get_ad_sets() is called 5 times as max 5 reties provided for function
+        self.assertEqual(mocked_account.get_ad_sets.call_count, 5)
 
     def test__call_get_campaigns(self, mocked_sleep):
         """ 
@@ -144,33 +129,25 @@ class TestAttributErrorBackoff(unittest.TestCase):
         self.assertEqual(mocked_account.get_campaigns.call_count, 5)
 
     @mock.patch("pendulum.parse")
-    def test_campaign_prepare_record(self, mocked_parse, mocked_sleep):
+    def test_campaign_iter(self, mocked_parse, mocked_sleep):
         """ 
-            __iter__ of Campaigns calls a function _iterate which calls a nested prepare_record function.
-            Prepare_record calls a `facebook_business` method,`ad.api_get()`, to get a ad fields. 
-            We mock this method to raise a `AttributeError` and expect the tap to retry this that function up to 5 times,
-            which is the current hard coded `max_tries` value.
+            __iter__ of Campaigns lists campaigns with every selected field through `get_campaigns()`, so no
+            request is made per object. We mock this method to raise a `AttributeError` and expect the tap to
+            retry the listing up to 5 times, which is the current hard coded `max_tries` value.
         """
-
-        # # Mock campaign object
-        mocked_campaign = Mock()
-        mocked_campaign.api_get = Mock()
-        mocked_campaign.__getitem__ = Mock()
-        mocked_campaign.api_get.side_effect = AttributeError
-
-        # # Mock get_campaigns function return mocked ad object
+        # Mock get_campaigns function to throw AttributeError exception
         mocked_account = Mock()
         mocked_account.get_campaigns = Mock()
-        mocked_account.get_campaigns.side_effect = [[mocked_campaign]]
+        mocked_account.get_campaigns.side_effect = AttributeError
 
-        # Iterate campaigns object which calls prepare_record() inside and verify AttributeError is raised
+        # Iterate campaign object which lists campaigns and verify AttributeError is raised
         campaign_object = Campaigns('', mocked_account, '', '', '')
         with self.assertRaises(AttributeError):
             for message in campaign_object:
                 pass
 
-        # verify prepare_record() function by checking call count of mocked ad.api_get()
-        self.assertEqual(mocked_campaign.api_get.call_count, 5)
+        # verify get_campaigns() is called 5 times as max 5 reties provided for function
+        self.assertEqual(mocked_account.get_campaigns.call_count, 5)
 
     def test_run_job(self, mocked_sleep):
         """ 
@@ -0,0 +1,372 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from unittest.mock import Mock
+import tap_facebook
+from tap_facebook import AdsInsights
+from facebook_business.exceptions import FacebookRequestError
+
+def make_params(day):
+    return {'time_ranges': [{'since': day, 'until': day}]}
+
+class FakeJob:
+
+    def __init__(self, day):
+        self.day = day
+
+    def get_result(self, params=None):
+        row = Mock()
+        row.export_all_data.return_value = {'date_start': self.day, 'date_stop': self.day}
+        return [row]
+
+@mock.patch.dict('tap_facebook.CONFIG', {'start_date': '2019-01-01T00:00:00Z'}, clear=True)
+class TestInsightsJobScheduler(unittest.TestCase):
+    """A set of unit tests to ensure that concurrent insights jobs are emitted in date order"""
+
+    days = ['2024-01-01', '2024-01-02', '2024-01-03']
+
+    def run_stream(self, run_job):
+        insights = AdsInsights('insights', Mock(), 'insights', None, {}, {})
+        with mock.patch.object(AdsInsights, 'job_params', return_value=[make_params(day) for day in self.days]), \
+             mock.patch.object(AdsInsights, 'run_job', side_effect=run_job, autospec=True):
+            return list(insights)
+
+    def test_serial_jobs_by_default(self):
+        """
+            Without `insights_max_concurrent_jobs` every job is run and drained one after another
+        """
+        messages = self.run_stream(lambda stream, params: FakeJob(params['time_ranges'][0]['since']))
+
+        records = [message['record']['date_start'] for message in messages if 'record' in message]
+        self.assertEqual(self.days, records)
+        self.assertEqual(3, len([message for message in messages if 'state' in message]))
+
+    def test_concurrent_jobs_are_emitted_in_date_order(self):
+        """
+            The first job only completes after the last job does, records and bookmarks must
+            still be emitted in date order
+        """
+        tap_facebook.CONFIG['insights_max_concurrent_jobs'] = 3
+        last_job_done = threading.Event()
+
+        def run_job(stream, params):
+            day = params['time_ranges'][0]['since']
+            if day == self.days[0]:
+                self.assertTrue(last_job_done.wait(5))
+            elif day == self.days[-1]:
+                last_job_done.set()
+            return FakeJob(day)
+
+        messages = self.run_stream(run_job)
+
+        emitted = [message['record']['date_start'] if 'record' in message
+                   else message['state']['bookmarks']['insights']['date_start']
+                   for message in messages]
+        self.assertEqual(['2024-01-01', '2024-01-01T00:00:00+00:00',
+                          '2024-01-02', '2024-01-02T00:00:00+00:00',
+                          '2024-01-03', '2024-01-03T00:00:00+00:00'], emitted)
+
+    def test_concurrent_job_failure_is_raised(self):
+        """
+            A failing job surfaces its error to the stream once it is the next job in date order
+        """
+        tap_facebook.CONFIG['insights_max_concurrent_jobs'] = 2
+
+        def run_job(stream, params):
+            if params['time_ranges'][0]['since'] == self.days[1]:
+                raise tap_facebook.TapFacebookException('job failed')
+            return FakeJob(params['time_ranges'][0]['since'])
+
+        with self.assertRaises(tap_facebook.TapFacebookException):
+            self.run_stream(run_job)
+
+
+@mock.patch.dict('tap_facebook.CONFIG', {'start_date': '2019-01-01T00:00:00Z', 'insights_days_per_job': 7}, clear=True)
+class TestInsightsDaysPerJob(unittest.TestCase):
+    """A set of unit tests to ensure that several days can be packed into one insights job"""
+
+    def test_job_params_pack_days(self):
+        """
+            Every job holds one single day time range per day, up to `insights_days_per_job`
+        """
+        insights = AdsInsights('insights', None, 'insights', None,
+                               {'bookmarks': {'insights': {'date_start': '2024-01-29'}}}, {})
+        tap_facebook.CONFIG['end_date'] = '2024-02-08'
+
+        params = list(insights.job_params())
+
+        self.assertEqual([7, 7, 7, 7, 7, 4], [len(param['time_ranges']) for param in params])
+        self.assertEqual({'since': '2024-01-01', 'until': '2024-01-01'}, params[0]['time_ranges'][0])
+        self.assertEqual({'since': '2024-01-07', 'until': '2024-01-07'}, params[0]['time_ranges'][-1])
+        self.assertEqual({'since': '2024-02-08', 'until': '2024-02-08'}, params[-1]['time_ranges'][-1])
+
+    @mock.patch("time.sleep")
+    def test_failed_job_is_split(self, mocked_sleep):
+        """
+            A job spanning several days that times out is split in half until the jobs succeed
+        """
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+        days = ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']
+
+        def run_job(stream, params):
+            if len(params['time_ranges']) > 2:
+                raise tap_facebook.InsightsJobTimeout('job timed out')
+            return FakeJob(params['time_ranges'][0]['since'])
+
+        with mock.patch.object(AdsInsights, '_run_job', side_effect=run_job, autospec=True) as mocked_run_job:
+            jobs = insights.run_jobs({'time_ranges': [make_params(day)['time_ranges'][0] for day in days]})
+
+        self.assertEqual([['2024-01-01', '2024-01-02'], ['2024-01-03', '2024-01-04']],
+                         [[time_range['since'] for time_range in params['time_ranges']] for params, job in jobs])
+        self.assertEqual(3, mocked_run_job.call_count)
+
+    @mock.patch("time.sleep")
+    def test_throttled_job_is_retried_not_split(self, mocked_sleep):
+        """
+            A job spanning several days that is throttled is retried as a whole instead of being split
+        """
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+        params = {'time_ranges': [make_params(day)['time_ranges'][0] for day in ['2024-01-01', '2024-01-02']]}
+        throttled = FacebookRequestError('throttled', {}, 400, {}, json.dumps(
+            {'error': {'code': 80000, 'message': 'There have been too many calls from this ad-account.'}}))
+
+        with mock.patch.object(AdsInsights, '_run_job', side_effect=[throttled, FakeJob('2024-01-01')],
+                               autospec=True) as mocked_run_job:
+            jobs = insights.run_jobs(params)
+
+        self.assertEqual([params], [job_params for job_params, job in jobs])
+        self.assertEqual(2, mocked_run_job.call_count)
+
+    @mock.patch("time.sleep")
+    def test_reduce_data_error_splits_job(self, mocked_sleep):
+        """
+            A job spanning several days that Facebook asks to reduce is split right away
+        """
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+        params = {'time_ranges': [make_params(day)['time_ranges'][0] for day in ['2024-01-01', '2024-01-02']]}
+        reduce_data = FacebookRequestError('reduce', {}, 500, {}, json.dumps({'error': {
+            'code': 1, 'message': "Please reduce the amount of data you're asking for, then retry your request"}}))
+
+        def run_job(stream, params):
+            if len(params['time_ranges']) > 1:
+                raise reduce_data
+            return FakeJob(params['time_ranges'][0]['since'])
+
+        with mock.patch.object(AdsInsights, '_run_job', side_effect=run_job, autospec=True) as mocked_run_job:
+            jobs = insights.run_jobs(params)
+
+        self.assertEqual(2, len(jobs))
+        self.assertEqual(3, mocked_run_job.call_count)
+
+    @mock.patch("time.sleep")
+    def test_reduce_data_error_of_single_day_job_is_retried(self, mocked_sleep):
+        """
+            A single day job cannot be split, Facebook asking to reduce it is retried like other server errors
+        """
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+        reduce_data = FacebookRequestError('reduce', {}, 500, {}, json.dumps({'error': {
+            'code': 1, 'message': "Please reduce the amount of data you're asking for, then retry your request"}}))
+
+        with mock.patch.object(AdsInsights, '_run_job', side_effect=[reduce_data, FakeJob('2024-01-01')],
+                               autospec=True) as mocked_run_job:
+            jobs = insights.run_jobs(make_params('2024-01-01'))
+
+        self.assertEqual(1, len(jobs))
+        self.assertEqual(2, mocked_run_job.call_count)
+
+    def test_multi_day_job_bookmarks_last_day(self):
+        """
+            The bookmark of a job spanning several days moves to the end of its last time range
+        """
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+        params = {'time_ranges': [make_params(day)['time_ranges'][0] for day in ['2024-01-01', '2024-01-02']]}
+
+        with mock.patch.object(AdsInsights, 'iter_jobs', return_value=[(params, FakeJob('2024-01-01'))]):
+            messages = list(insights)
+
+        self.assertEqual('2024-01-02T00:00:00+00:00', messages[-1]['state']['bookmarks']['insights']['date_start'])
+
+
+class TestInsightsPollInterval(unittest.TestCase):
+    """A set of unit tests to ensure that insights jobs are polled close to their completion"""
+
+    def test_interval_follows_progress(self):
+        """
+            A job 80% done after 40 seconds should be done in 10 seconds, half of it is waited
+        """
+        self.assertEqual(5, tap_facebook.get_poll_interval(40, 80, None, 1, 300))
+
+    def test_interval_uses_expected_duration_without_progress(self):
+        """
+            Without progress the interval is based on the duration of the previous jobs
+        """
+        self.assertEqual(50, tap_facebook.get_poll_interval(20, 0, 120, 1, 300))
+
+    def test_interval_backs_off_past_expected_duration(self):
+        """
+            A job still at 0% past its expected duration is polled less and less often
+        """
+        self.assertEqual([30, 60, 120], [tap_facebook.get_poll_interval(elapsed, 0, 60, 5, 300)
+                                         for elapsed in [60, 120, 240]])
+
+    def test_interval_is_bounded(self):
+        """
+            The interval stays between the configured floor and ceiling
+        """
+        self.assertEqual(5, tap_facebook.get_poll_interval(0, 0, None, 5, 300))
+        self.assertEqual(300, tap_facebook.get_poll_interval(1000, 1, None, 5, 300))
+
+    @mock.patch.dict('tap_facebook.CONFIG', {}, clear=True)
+    @mock.patch("time.sleep")
+    def test_completed_jobs_feed_expected_duration(self, mocked_sleep):
+        """
+            The duration of every completed job is kept to estimate the next ones
+        """
+        polls = iter([('Job Running', 0), ('Job Completed', 100)])
+        report_run = Mock()
+        def api_get():
+            status, percent = next(polls)
+            report_run.__getitem__ = Mock(side_effect={'async_status': status,
+                                                       'async_percent_completion': percent,
+                                                       'id': '1'}.get)
+            return report_run
+        report_run.api_get.side_effect = api_get
+        mocked_account = Mock()
+        mocked_account.get_insights.return_value = report_run
+        insights = AdsInsights('insights', mocked_account, 'insights', None, {}, {})
+        params = make_params('2024-01-01')
+
+        self.assertIsNone(insights.expected_job_duration(params))
+        insights.run_job(params)
+
+        self.assertIsNotNone(insights.expected_job_duration(params))
+        mocked_sleep.assert_called_once_with(tap_facebook.INSIGHTS_MIN_ASYNC_SLEEP_SECONDS)
+
+    @mock.patch.dict('tap_facebook.CONFIG', {}, clear=True)
+    @mock.patch("time.sleep")
+    def test_stopped_stream_abandons_job(self, mocked_sleep):
+        """
+            A job still running once the stream is stopped is no longer polled
+        """
+        report_run = Mock()
+        report_run.__getitem__ = Mock(side_effect={'async_status': 'Job Running',
+                                                   'async_percent_completion': 0,
+                                                   'id': '1'}.get)
+        report_run.api_get.return_value = report_run
+        mocked_account = Mock()
+        mocked_account.get_insights.return_value = report_run
+        insights = AdsInsights('insights', mocked_account, 'insights', None, {}, {})
+        stop = threading.Event()
+        insights.stop_events = (stop,)
+        mocked_sleep.side_effect = lambda seconds: stop.set()
+
+        with self.assertRaisesRegex(tap_facebook.TapFacebookException, 'abandoned'):
+            insights.run_job(make_params('2024-01-01'))
+
+        self.assertEqual(1, report_run.api_get.call_count)
+
+
+class TestInsightsJobHistory(unittest.TestCase):
+    """A set of unit tests to ensure that the telemetry of insights jobs is kept across syncs"""
+
+    def setUp(self):
+        self.history_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.history_dir.cleanup)
+        self.path = os.path.join(self.history_dir.name, 'history.jsonl')
+        config = mock.patch.dict('tap_facebook.CONFIG', {'start_date': '2019-01-01T00:00:00Z',
+                                                         'insights_job_history_path': self.path}, clear=True)
+        config.start()
+        self.addCleanup(config.stop)
+
+    def make_entry(self, days, outcome, duration):
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+        shape = insights.job_shape({'fields': ['impressions'], 'time_ranges': [None] * days})
+        return dict(shape, polls=1, outcome=outcome, duration=duration, rows=None)
+
+    def test_history_is_reloaded(self):
+        """
+            Recorded jobs are read back by the next sync and estimate the duration of its jobs
+        """
+        tap_facebook.get_job_history().record(self.make_entry(1, 'completed', 42))
+        tap_facebook.JOB_HISTORY = None
+
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+
+        self.assertEqual(42, insights.expected_job_duration({'fields': ['impressions'],
+                                                             'time_ranges': [None]}))
+        self.assertIsNone(insights.expected_job_duration({'fields': ['impressions', 'clicks'],
+                                                          'time_ranges': [None]}))
+
+    def test_unreliable_job_sizes_are_halved(self):
+        """
+            Days per job are halved while most previous jobs of that size did not complete
+        """
+        tap_facebook.CONFIG['insights_days_per_job'] = 8
+        history = tap_facebook.get_job_history()
+        history.record(self.make_entry(8, 'timeout', 1800))
+        history.record(self.make_entry(4, 'completed', 60))
+        history.record(self.make_entry(4, 'failed', 60))
+
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+
+        self.assertEqual(4, insights.tuned_days_per_job(1))
+        self.assertEqual(8, insights.tuned_days_per_job(2))
+
+    def test_completed_job_is_recorded_with_its_rows(self):
+        """
+            A completed job is recorded once its rows are read, a failed one right away
+        """
+        report_run = Mock()
+        report_run.api_get.return_value = report_run
+        report_run.__getitem__ = Mock(side_effect={'async_status': 'Job Completed',
+                                                   'async_percent_completion': 100,
+                                                   'id': '1'}.get)
+        report_run.get_result.return_value = [Mock(**{'export_all_data.return_value': {'date_start': '2024-01-01',
+                                                                                       'date_stop': '2024-01-01'}})]
+        insights = AdsInsights('insights', Mock(), 'insights', None, {}, {})
+        insights.account.get_insights.return_value = report_run
+
+        with mock.patch.object(AdsInsights, 'job_params', return_value=[make_params('2024-01-01')]):
+            list(insights)
+
+        entries = list(tap_facebook.get_job_history().entries)
+        self.assertEqual(1, len(entries))
+        self.assertEqual(('completed', 1, 1, 1), (entries[0]['outcome'], entries[0]['polls'],
+                                                  entries[0]['rows'], entries[0]['days']))
+
+
+@mock.patch.dict('tap_facebook.CONFIG', {'start_date': '2019-01-01T00:00:00Z', 'insights_result_page_size': 5000}, clear=True)
+class TestInsightsResultPageSize(unittest.TestCase):
+    """A set of unit tests to ensure that the results of insights jobs can be read in large pages"""
+
+    def test_results_are_read_in_configured_pages(self):
+        """
+            Rows are read with `insights_result_page_size` as limit and still emitted in order
+        """
+        job = Mock()
+        rows = [Mock(**{'export_all_data.return_value': {'date_start': '2024-01-01', 'date_stop': '2024-01-01',
+                                                         'ad_id': str(index)}})
+                for index in range(3)]
+        job.get_result.return_value = iter(rows)
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+
+        with mock.patch.object(AdsInsights, 'iter_jobs', return_value=[(make_params('2024-01-01'), job)]):
+            messages = list(insights)
+
+        job.get_result.assert_called_once_with(params={'limit': 5000})
+        self.assertEqual(['0', '1', '2'], [message['record']['ad_id'] for message in messages if 'record' in message])
+
+    def test_results_are_read_in_default_pages(self):
+        """
+            Without `insights_result_page_size` rows are read with the default limit of the tap
+        """
+        tap_facebook.CONFIG.pop('insights_result_page_size', None)
+        job = Mock()
+        job.get_result.return_value = iter([])
+        insights = AdsInsights('insights', None, 'insights', None, {}, {})
+
+        self.assertEqual([], list(insights.get_job_result(job)))
+        job.get_result.assert_called_once_with(params={'limit': tap_facebook.RESULT_RETURN_LIMIT})
@@ -0,0 +1,53 @@
+import copy
+import unittest
+import tap_facebook
+from tap_facebook import RecordTransformer, transform_date_hook
+from singer import Transformer
+from singer.transform import SchemaMismatch
+
+class Stream:
+    def __init__(self, name):
+        self.name = name
+
+class TestRecordTransformer(unittest.TestCase):
+    """A set of unit tests to ensure that compiled transforms match singer's Transformer"""
+
+    def assert_same_transform(self, stream_name, record, metadata=None):
+        schema = tap_facebook.SCHEMAS.schema(Stream(stream_name))
+        expected = Transformer(pre_hook=transform_date_hook).transform(copy.deepcopy(record), copy.deepcopy(schema),
+                                                                       metadata=metadata)
+        self.assertEqual(expected, RecordTransformer().transform(copy.deepcopy(record), schema, metadata=metadata))
+
+    def test_insights_record(self):
+        """
+            Numbers, dates, nested arrays and fields missing from the schema are converted like singer does
+        """
+        self.assert_same_transform('ads_insights', {
+            'date_start': '2024-01-01', 'date_stop': '2024-01-01', 'ad_id': '1',
+            'impressions': '1,234', 'spend': '3.5', 'clicks': None, 'cpc': '',
+            'actions': [{'action_type': 'link_click', 'value': '1.5', '1d_click': '2'}],
+            'not_in_schema': 'value'})
+
+    def test_object_record(self):
+        """
+            Nested objects and date-time offsets are converted like singer does
+        """
+        self.assert_same_transform('ads', {
+            'id': '1', 'updated_time': '2024-01-01T10:00:00-0400', 'bid_amount': '12', 'name': 5,
+            'targeting': {'age_min': 18, 'geo_locations': {'countries': ['US']}, 'not_in_schema': 1}})
+
+    def test_unselected_fields_are_dropped(self):
+        """
+            Fields that are not selected are dropped, automatic ones are kept
+        """
+        metadata = {(): {}, ('properties', 'name'): {'selected': False},
+                    ('properties', 'id'): {'selected': False, 'inclusion': 'automatic'}}
+        self.assert_same_transform('ads', {'id': '1', 'name': 'ad'}, metadata)
+
+    def test_mismatch_raises_schema_mismatch(self):
+        """
+            A record that does not match the schema raises singer's SchemaMismatch
+        """
+        schema = tap_facebook.SCHEMAS.schema(Stream('ads_insights'))
+        with self.assertRaises(SchemaMismatch):
+            RecordTransformer().transform({'date_start': '2024-01-01', 'impressions': 'many'}, schema)
@@ -0,0 +1,124 @@
+import json
+import threading
+import unittest
+from unittest import mock
+from unittest.mock import Mock
+import tap_facebook
+from tap_facebook import RequestGovernor
+from facebook_business.exceptions import FacebookRequestError
+
+def business_usage(usage_type, call_count, regain_minutes=0):
+    return json.dumps({'1234': [{'type': usage_type, 'call_count': call_count, 'total_cputime': 1,
+                                 'total_time': 1, 'estimated_time_to_regain_access': regain_minutes}]})
+
+@mock.patch.dict('tap_facebook.CONFIG', {}, clear=True)
+class TestRequestGovernor(unittest.TestCase):
+    """A set of unit tests to ensure that requests are paced from the usage reported by Facebook"""
+
+    def test_no_delay_under_target(self):
+        """
+            Requests are not delayed while the usage stays under `rate_limit_target_pct`
+        """
+        governor = RequestGovernor()
+        governor.observe({'x-ad-account-usage': json.dumps({'acc_id_util_pct': 50})}, '1')
+
+        self.assertEqual(0, governor.delay('act_1/ads'))
+
+    def test_delay_grows_over_target(self):
+        """
+            Over the target the delay grows with the usage, up to the longest pacing delay
+        """
+        tap_facebook.CONFIG['rate_limit_target_pct'] = 50
+        governor = RequestGovernor()
+
+        governor.observe({'x-business-use-case-usage': business_usage('ads_management', 75)}, '1')
+        self.assertEqual(tap_facebook.RATE_LIMIT_MAX_PACING_SECONDS / 2, governor.delay('act_1/ads'))
+
+        governor.observe({'x-business-use-case-usage': business_usage('ads_management', 100)}, '1')
+        self.assertEqual(tap_facebook.RATE_LIMIT_MAX_PACING_SECONDS, governor.delay('act_1/ads'))
+
+    def test_insights_usage_only_paces_insights_requests(self):
+        """
+            The insights throttle only delays insights requests
+        """
+        governor = RequestGovernor()
+        governor.observe({'x-fb-ads-insights-throttle': json.dumps({'app_id_util_pct': 100, 'acc_id_util_pct': 10})}, '1')
+
+        self.assertEqual(0, governor.delay('act_1/ads'))
+        self.assertEqual(tap_facebook.RATE_LIMIT_MAX_PACING_SECONDS, governor.delay('act_1/insights'))
+
+    @mock.patch("time.time", return_value=1000)
+    def test_requests_wait_to_regain_access(self, mocked_time):
+        """
+            Once a limit is hit requests are held until Facebook says access is regained
+        """
+        governor = RequestGovernor()
+        governor.observe({'x-business-use-case-usage': business_usage('ads_insights', 100, regain_minutes=2)}, '1')
+
+        self.assertEqual(120, governor.delay('act_1/ads'))
+
+    def test_usage_missing_from_a_response_is_kept(self):
+        """
+            A response that does not report the account usage does not reset it
+        """
+        governor = RequestGovernor()
+        governor.observe({'x-ad-account-usage': json.dumps({'acc_id_util_pct': 95})}, '1')
+        delay = governor.delay('act_1/ads')
+
+        governor.observe({'x-business-use-case-usage': business_usage('ads_insights', 10)}, '1')
+        governor.observe({}, '1')
+
+        self.assertEqual(24, delay)
+        self.assertEqual(delay, governor.delay('act_1/ads'))
+
+    def test_stale_usage_stops_pacing(self):
+        """
+            Usage that was not reported again for RATE_LIMIT_USAGE_STALE_SECONDS no longer paces requests
+        """
+        governor = RequestGovernor()
+        with mock.patch("time.time", return_value=1000):
+            governor.observe({'x-ad-account-usage': json.dumps({'acc_id_util_pct': 95})}, '1')
+        with mock.patch("time.time", return_value=1001 + tap_facebook.RATE_LIMIT_USAGE_STALE_SECONDS):
+            self.assertEqual(0, governor.delay('act_1/ads'))
+
+    @mock.patch("time.time", return_value=1000)
+    def test_other_accounts_are_not_paced(self, mocked_time):
+        """
+            An account that hit its limit does not hold or pace the requests of other accounts
+        """
+        governor = RequestGovernor()
+        governor.observe({'x-ad-account-usage': json.dumps({'acc_id_util_pct': 100, 'reset_time_duration': 60})}, '1')
+
+        self.assertEqual(60, governor.delay('act_1/ads'))
+        self.assertEqual(0, governor.delay('act_2/ads'))
+
+    @mock.patch("time.sleep")
+    @mock.patch("time.time", return_value=1000)
+    def test_requests_take_shared_slots(self, mocked_time, mocked_sleep):
+        """
+            Requests of an account are spaced by the pacing delay whatever thread sends them
+        """
+        governor = RequestGovernor()
+        governor.observe({'x-ad-account-usage': json.dumps({'acc_id_util_pct': 95})}, '1')
+
+        threads = [threading.Thread(target=governor.wait, args=('act_1/ads',)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([24, 48], sorted(call.args[0] for call in mocked_sleep.call_args_list))
+
+    @mock.patch("tap_facebook.original_call")
+    def test_failed_request_headers_are_observed(self, mocked_call):
+        """
+            The usage headers of a failed request are observed before its error is raised
+        """
+        headers = {'x-ad-account-usage': json.dumps({'acc_id_util_pct': 90})}
+        mocked_call.side_effect = FacebookRequestError('throttled', {}, 400, headers, '{}')
+
+        with mock.patch.object(tap_facebook, 'GOVERNOR', RequestGovernor()):
+            with self.assertRaises(FacebookRequestError):
+                tap_facebook.governed_call(Mock(), 'GET', 'act_1/ads')
+
+            self.assertLess(0, tap_facebook.GOVERNOR.delay('act_1/ads'))
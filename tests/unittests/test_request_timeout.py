@@ -49,32 +49,25 @@ class TestRequestTimeoutBackoff(unittest.TestCase):
         self.assertEqual(mocked_account.get_ads.call_count, 5)
 
     @mock.patch("pendulum.parse")
-    def test_ad_prepare_record(self, mocked_parse, mocked_sleep):
+    def test_ad_iter(self, mocked_parse, mocked_sleep):
         """ 
-            __iter__ of Ads calls a function _iterate which calls a nested prepare_record function.
-            Prepare_record calls a `facebook_business` method,`ad.api_get()`, to get a ad fields. 
-            We mock this method to raise a `Timeout` and expect the tap to retry this that function up to 5 times,
-            which is the current hard coded `max_tries` value.
+            __iter__ of Ads lists ads with every selected field through `get_ads()`, so no
+            request is made per object. We mock this method to raise a `Timeout` and expect the tap to
+            retry the listing up to 5 times, which is the current hard coded `max_tries` value.
         """
-        # Mock ad object
-        mocked_ad = Mock()
-        mocked_ad.api_get = Mock()
-        mocked_ad.__getitem__ = Mock()
-        mocked_ad.api_get.side_effect = Timeout
-
-        # # Mock get_ads function return mocked ad object
+        # Mock get_ads function to throw Timeout exception
         mocked_account = Mock()
         mocked_account.get_ads = Mock()
-        mocked_account.get_ads.side_effect = [[mocked_ad]]
+        mocked_account.get_ads.side_effect = Timeout
 
-        # Iterate ads object which calls prepare_record() inside and verify Timeout is raised
+        # Iterate ad object which lists ads and verify Timeout is raised
         ad_object = Ads('', mocked_account, '', '', '')
         with self.assertRaises(Timeout):
             for message in ad_object:
                 pass
 
-        # verify prepare_record() function by checking call count of mocked ad.api_get()
-        self.assertEqual(mocked_ad.api_get.call_count, 5)
+        # verify get_ads() is called 5 times as max 5 reties provided for function
+        self.assertEqual(mocked_account.get_ads.call_count, 5)
 
     def test__call_get_ad_sets(self, mocked_sleep):
         """ 
@@ -97,33 +90,25 @@ class TestRequestTimeoutBackoff(unittest.TestCase):
         self.assertEqual(mocked_account.get_ad_sets.call_count, 5)
 
     @mock.patch("pendulum.parse")
-    def test_adset_prepare_record(self, mocked_parse, mocked_sleep):
+    def test_adset_iter(self, mocked_parse, mocked_sleep):
         """ 
-            __iter__ of AdSets calls a function _iterate which calls a nested prepare_record function.
-            Prepare_record calls a `facebook_business` method,`ad.api_get()`, to get a ad fields. 
-            We mock this method to raise a `Timeout` and expect the tap to retry this that function up to 5 times,
-            which is the current hard coded `max_tries` value.
+            __iter__ of AdSets lists adsets with every selected field through `get_ad_sets()`, so no
+            request is made per object. We mock this method to raise a `Timeout` and expect the tap to
+            retry the listing up to 5 times, which is the current hard coded `max_tries` value.
         """
-
-        # Mock adset object
-        mocked_adset = Mock()
-        mocked_adset.api_get = Mock()
-        mocked_adset.__getitem__ = Mock()
-        mocked_adset.api_get.side_effect = Timeout
-
-        # Mock get_ad_sets function return mocked ad object
+        # Mock get_ad_sets function to throw Timeout exception
         mocked_account = Mock()
         mocked_account.get_ad_sets = Mock()
-        mocked_account.get_ad_sets.side_effect = [[mocked_adset]]
+        mocked_account.get_ad_sets.side_effect = Timeout
 
-        # Iterate adset object which calls prepare_record() inside and verify Timeout is raised
-        ad_set_object = AdSets('', mocked_account, '', '', '')
+        # Iterate adset object which lists adsets and verify Timeout is raised
+        adset_object = AdSets('', mocked_account, '', '', '')
         with self.assertRaises(Timeout):
-            for message in ad_set_object:
+            for message in adset_object:
                 pass
 
-        # verify prepare_record() function by checking call count of mocked ad.api_get()
-        self.assertEqual(mocked_adset.api_get.call_count, 5)
+        # verify get_ad_sets() is called 5 times as max 5 reties provided for function
+        self.assertEqual(mocked_account.get_ad_sets.call_count, 5)
 
     def test__call_get_campaigns(self, mocked_sleep):
         """ 
@@ -146,33 +131,25 @@ class TestRequestTimeoutBackoff(unittest.TestCase):
         self.assertEqual(mocked_account.get_campaigns.call_count, 5)
 
     @mock.patch("pendulum.parse")
-    def test_campaign_prepare_record(self, mocked_parse, mocked_sleep):
+    def test_campaign_iter(self, mocked_parse, mocked_sleep):
         """ 
-            __iter__ of Campaigns calls a function _iterate which calls a nested prepare_record function.
-            Prepare_record calls a `facebook_business` method,`ad.api_get()`, to get a ad fields. 
-            We mock this method to raise a `Timeout` and expect the tap to retry this that function up to 5 times,
-            which is the current hard coded `max_tries` value.
+            __iter__ of Campaigns lists campaigns with every selected field through `get_campaigns()`, so no
+            request is made per object. We mock this method to raise a `Timeout` and expect the tap to
+            retry the listing up to 5 times, which is the current hard coded `max_tries` value.
         """
-
-        # # Mock campaign object
-        mocked_campaign = Mock()
-        mocked_campaign.api_get = Mock()
-        mocked_campaign.__getitem__ = Mock()
-        mocked_campaign.api_get.side_effect = Timeout
-
-        # # Mock get_campaigns function return mocked ad object
+        # Mock get_campaigns function to throw Timeout exception
         mocked_account = Mock()
         mocked_account.get_campaigns = Mock()
-        mocked_account.get_campaigns.side_effect = [[mocked_campaign]]
+        mocked_account.get_campaigns.side_effect = Timeout
 
-        # Iterate campaigns object which calls prepare_record() inside and verify Timeout is raised
+        # Iterate campaign object which lists campaigns and verify Timeout is raised
         campaign_object = Campaigns('', mocked_account, '', '', '')
         with self.assertRaises(Timeout):
             for message in campaign_object:
                 pass
 
-        # verify prepare_record() function by checking call count of mocked ad.api_get()
-        self.assertEqual(mocked_campaign.api_get.call_count, 5)
+        # verify get_campaigns() is called 5 times as max 5 reties provided for function
+        self.assertEqual(mocked_account.get_campaigns.call_count, 5)
 
     def test_run_job(self, mocked_sleep):
         """ 
@@ -238,32 +215,25 @@ class TestConnectionErrorBackoff(unittest.TestCase):
         self.assertEqual(mocked_account.get_ads.call_count, 5)
 
     @mock.patch("pendulum.parse")
-    def test_ad_prepare_record(self, mocked_parse, mocked_sleep):
+    def test_ad_iter(self, mocked_parse, mocked_sleep):
         """ 
-            __iter__ of Ads calls a function _iterate which calls a nested prepare_record function.
-            Prepare_record calls a `facebook_business` method,`ad.api_get()`, to get a ad fields. 
-            We mock this method to raise a `ConnectionError` and expect the tap to retry this that function up to 5 times,
-            which is the current hard coded `max_tries` value.
+            __iter__ of Ads lists ads with every selected field through `get_ads()`, so no
+            request is made per object. We mock this method to raise a `ConnectionError` and expect the tap to
+            retry the listing up to 5 times, which is the current hard coded `max_tries` value.
         """
-        # Mock ad object
-        mocked_ad = Mock()
-        mocked_ad.api_get = Mock()
-        mocked_ad.__getitem__ = Mock()
-        mocked_ad.api_get.side_effect = ConnectionError
-
-        # # Mock get_ads function return mocked ad object
+        # Mock get_ads function to throw ConnectionError exception
         mocked_account = Mock()
         mocked_account.get_ads = Mock()
-        mocked_account.get_ads.side_effect = [[mocked_ad]]
+        mocked_account.get_ads.side_effect = ConnectionError
 
-        # Iterate ads object which calls prepare_record() inside and verify ConnectionError is raised
+        # Iterate ad object which lists ads and verify ConnectionError is raised
         ad_object = Ads('', mocked_account, '', '', '')
         with self.assertRaises(ConnectionError):
             for message in ad_object:
                 pass
 
-        # verify prepare_record() function by checking call count of mocked ad.api_get()
-        self.assertEqual(mocked_ad.api_get.call_count, 5)
+        # verify get_ads() is called 5 times as max 5 reties provided for function
+        self.assertEqual(mocked_account.get_ads.call_count, 5)
 
     def test__call_get_ad_sets(self, mocked_sleep):
         """ 
@@ -286,33 +256,25 @@ class TestConnectionErrorBackoff(unittest.TestCase):
         self.assertEqual(mocked_account.get_ad_sets.call_count, 5)
 
     @mock.patch("pendulum.parse")
-    def test_adset_prepare_record(self, mocked_parse, mocked_sleep):
+    def test_adset_iter(self, mocked_parse, mocked_sleep):
         """ 
-            __iter__ of AdSets calls a function _iterate which calls a nested prepare_record function.
-            Prepare_record calls a `facebook_business` method,`ad.api_get()`, to get a ad fields. 
-            We mock this method to raise a `ConnectionError` and expect the tap to retry this that function up to 5 times,
-            which is the current hard coded `max_tries` value.
+            __iter__ of AdSets lists adsets with every selected field through `get_ad_sets()`, so no
+            request is made per object. We mock this method to raise a `ConnectionError` and expect the tap to
+            retry the listing up to 5 times, which is the current hard coded `max_tries` value.
         """
-
-        # Mock adset object
-        mocked_adset = Mock()
-        mocked_adset.api_get = Mock()
-        mocked_adset.__getitem__ = Mock()
-        mocked_adset.api_get.side_effect = ConnectionError
-
-        # Mock get_ad_sets function return mocked ad object
+        # Mock get_ad_sets function to throw ConnectionError exception
         mocked_account = Mock()
         mocked_account.get_ad_sets = Mock()
-        mocked_account.get_ad_sets.side_effect = [[mocked_adset]]
+        mocked_account.get_ad_sets.side_effect = ConnectionError
 
-        # Iterate adset object which calls prepare_record() inside and verify ConnectionError is raised
-        ad_set_object = AdSets('', mocked_account, '', '', '')
+        # Iterate adset object which lists adsets and verify ConnectionError is raised
+        adset_object = AdSets('', mocked_account, '', '', '')
         with self.assertRaises(ConnectionError):
-            for message in ad_set_object:
+            for message in adset_object:
                 pass
 
-        # verify prepare_record() function by checking call count of mocked ad.api_get()
-        self.assertEqual(mocked_adset.api_get.call_count, 5)
+        # verify get_ad_sets() is called 5 times as max 5 reties provided for function
+        self.assertEqual(mocked_account.get_ad_sets.call_count, 5)
 
     def test__call_get_campaigns(self, mocked_sleep):
         """ 
@@ -335,33 +297,25 @@ class TestConnectionErrorBackoff(unittest.TestCase):
         self.assertEqual(mocked_account.get_campaigns.call_count, 5)
 
     @mock.patch("pendulum.parse")
-    def test_campaign_prepare_record(self, mocked_parse, mocked_sleep):
+    def test_campaign_iter(self, mocked_parse, mocked_sleep):
         """ 
-            __iter__ of Campaigns calls a function _iterate which calls a nested prepare_record function.
-            Prepare_record calls a `facebook_business` method,`ad.api_get()`, to get a ad fields. 
-            We mock this method to raise a `ConnectionError` and expect the tap to retry this that function up to 5 times,
-            which is the current hard coded `max_tries` value.
+            __iter__ of Campaigns lists campaigns with every selected field through `get_campaigns()`, so no
+            request is made per object. We mock this method to raise a `ConnectionError` and expect the tap to
+            retry the listing up to 5 times, which is the current hard coded `max_tries` value.
         """
-
-        # # Mock campaign object
-        mocked_campaign = Mock()
-        mocked_campaign.api_get = Mock()
-        mocked_campaign.__getitem__ = Mock()
-        mocked_campaign.api_get.side_effect = ConnectionError
-
-        # # Mock get_campaigns function return mocked ad object
+        # Mock get_campaigns function to throw ConnectionError exception
         mocked_account = Mock()
         mocked_account.get_campaigns = Mock()
-        mocked_account.get_campaigns.side_effect = [[mocked_campaign]]
+        mocked_account.get_campaigns.side_effect = ConnectionError
 
-        # Iterate campaigns object which calls prepare_record() inside and verify ConnectionError is raised
+        # Iterate campaign object which lists campaigns and verify ConnectionError is raised
         campaign_object = Campaigns('', mocked_account, '', '', '')
         with self.assertRaises(ConnectionError):
             for message in campaign_object:
                 pass
 
-        # verify prepare_record() function by checking call count of mocked ad.api_get()
-        self.assertEqual(mocked_campaign.api_get.call_count, 5)
+        # verify get_campaigns() is called 5 times as max 5 reties provided for function
+        self.assertEqual(mocked_account.get_campaigns.call_count, 5)
 
     def test_run_job(self, mocked_sleep):
         """ 
@@ -2,7 +2,7 @@ import unittest
 from unittest import mock
 from unittest.mock import Mock
 from tap_facebook import FacebookRequestError
-from tap_facebook import AdCreative, Leads
+from tap_facebook import AdCreative, Leads, execute_object_batch
 from singer import resolve_schema_references
 from singer.schema import Schema
 from singer.catalog import CatalogEntry
@@ -51,7 +51,8 @@ class TestAdCreativeSyncBbatches(unittest.TestCase):
 
         # verify calls inside sync_batches are called 5 times as max 5 retries provided for function
         self.assertEqual(5, mocked_api.new_batch.call_count)
-        self.assertEqual(5, mocked_schema.call_count)
+        # the resolved schema is cached, retries do not resolve it again
+        self.assertEqual(1, mocked_schema.call_count)
 
     @mock.patch("tap_facebook.API")
     @mock.patch("singer.resolve_schema_references")
@@ -76,7 +77,8 @@ class TestAdCreativeSyncBbatches(unittest.TestCase):
 
         # verify calls inside sync_batches are called 5 times as max 5 reties provided for function
         self.assertEqual(5, mocked_api.new_batch.call_count)
-        self.assertEqual(5, mocked_schema.call_count)
+        # the resolved schema is cached, retries do not resolve it again
+        self.assertEqual(1, mocked_schema.call_count)
 
     @mock.patch("tap_facebook.API")
     @mock.patch("singer.resolve_schema_references")
@@ -103,54 +105,108 @@ class TestAdCreativeSyncBbatches(unittest.TestCase):
 
 
 @mock.patch("time.sleep")
-class TestLeadsSyncBatches(unittest.TestCase):
+@mock.patch.dict("tap_facebook.CONFIG", {}, clear=True)
+class TestLeadsSync(unittest.TestCase):
+
+    def make_leads_object(self, mocked_account):
+        return Leads('leads', mocked_account, 'leads', CatalogEntry(schema=Schema()),
+                     {'bookmarks': {'leads': {'created_time': '2024-01-01T00:00:00+00:00'}}})
 
-    @mock.patch("tap_facebook.API")
     @mock.patch("singer.resolve_schema_references")
-    def test_retries_on_attribute_error_sync_batches(self, mocked_schema, mocked_api, mocked_sleep):
+    def test_retries_on_attribute_error_sync(self, mocked_schema, mocked_sleep):
         """ 
-            Leads.sync_batches calls a `facebook_business` method,`api_batch.execute()`, to get a batch of Leads. 
+            Leads.sync lists the ads through `Leads._call_get_ads`, which calls a `facebook_business` method,`get_ads()`.
             We mock this method to raise a `AttributeError` and expect the tap to retry this that function up to 5 times,
             which is the current hard coded `max_tries` value.
         """
-        # Mock new_batch() function of API
-        mocked_api.new_batch = Mock()
-        mocked_api.new_batch.return_value = MockBatch(exception="AttributeError") # Raise AttributeError exception
+        # Mock get_ads function to throw AttributeError exception
+        mocked_account = Mock()
+        mocked_account.get_ads.side_effect = AttributeError("'str' object has no attribute 'get'")
 
-        # Initialize Leads and mock catalog_entry
-        mock_catalog_entry = CatalogEntry(schema=Schema())
-        leads_object = Leads('', '', '', '', '')
-        leads_object.catalog_entry = mock_catalog_entry
-
-        # Call sync_batches() function of Leads and verify AttributeError is raised
+        # Call sync() function of Leads and verify AttributeError is raised
         with self.assertRaises(AttributeError):
-            leads_object.sync_batches([])
+            self.make_leads_object(mocked_account).sync(Mock())
 
-        # verify calls inside sync_batches are called 5 times as max 5 reties provided for function
-        self.assertEqual(5, mocked_api.new_batch.call_count)
-        self.assertEqual(5, mocked_schema.call_count)
+        # verify get_ads() is called 5 times as max 5 reties provided for function
+        self.assertEqual(5, mocked_account.get_ads.call_count)
 
-    @mock.patch("tap_facebook.API")
     @mock.patch("singer.resolve_schema_references")
-    def test_retries_on_facebook_request_error_sync_batches(self, mocked_schema, mocked_api, mocked_sleep):
+    def test_retries_on_facebook_request_error_sync(self, mocked_schema, mocked_sleep):
         """ 
-            Leads.sync_batches calls a `facebook_business` method,`api_batch.execute()`, to get a batch of Leads. 
+            Leads.sync lists the ads through `Leads._call_get_ads`, which calls a `facebook_business` method,`get_ads()`.
             We mock this method to raise a `FacebookRequestError` and expect the tap to retry this that function up to 5 times,
             which is the current hard coded `max_tries` value.
         """
-        # Mock new_batch() function of API
-        mocked_api.new_batch = Mock()
-        mocked_api.new_batch.return_value = MockBatch(exception="FacebookRequestError") # Raise FacebookRequestError exception
+        # Mock get_ads function to throw FacebookRequestError exception
+        mocked_account = Mock()
+        mocked_account.get_ads.side_effect = FacebookRequestError(
+            message='',
+            request_context={"":Mock()},
+            http_status=500,
+            http_headers=Mock(),
+            body={}
+        )
+
+        # Call sync() function of Leads and verify FacebookRequestError is raised
+        with self.assertRaises(FacebookRequestError):
+            self.make_leads_object(mocked_account).sync(Mock())
 
-        # Initialize Leads and mock catalog_entry
-        mock_catalog_entry = CatalogEntry(schema=Schema())
-        leads_object = Leads('', '', '', '', '')
-        leads_object.catalog_entry = mock_catalog_entry
+        # verify get_ads() is called 5 times as max 5 reties provided for function
+        self.assertEqual(5, mocked_account.get_ads.call_count)
 
-        # Call sync_batches() function of Leads and verify FacebookRequestError is raised
-        with self.assertRaises(FacebookRequestError):
-            leads_object.sync_batches([])
 
-        # verify calls inside sync_batches are called 5 times as max 5 reties provided for function
-        self.assertEqual(5, mocked_api.new_batch.call_count)
-        self.assertEqual(5, mocked_schema.call_count)
+class MockObjectBatch:
+    """Batch answering every queued call, the calls in `failing` fail once with a 500 error"""
+
+    def __init__(self, failing):
+        self.failing = failing
+        self.calls = []
+
+    def execute(self):
+        for object_id, success, failure in self.calls:
+            response = Mock()
+            if object_id in self.failing:
+                self.failing.remove(object_id)
+                response.error.return_value = FacebookRequestError(
+                    message='',
+                    request_context={"":Mock()},
+                    http_status=500,
+                    http_headers=Mock(),
+                    body={}
+                )
+                failure(response)
+            else:
+                response.json.return_value = {'id': object_id, 'name': 'object ' + object_id}
+                success(response)
+
+
+def make_object(object_id):
+    obj = Mock()
+    obj.api_get.side_effect = lambda fields, batch, success, failure: batch.calls.append((object_id, success, failure))
+    return obj
+
+
+@mock.patch("time.sleep")
+class TestExecuteObjectBatch(unittest.TestCase):
+
+    @mock.patch("tap_facebook.API")
+    def test_retries_only_failed_objects(self, mocked_api, mocked_sleep):
+        """
+            execute_object_batch reads the fields of every object with one batch request, a sub-request
+            that fails is retried on its own while the other responses are kept
+        """
+        failing = {'2'}
+        batches = []
+        def new_batch():
+            batches.append(MockObjectBatch(failing))
+            return batches[-1]
+        mocked_api.new_batch.side_effect = new_batch
+        objects = [make_object(object_id) for object_id in ['1', '2', '3']]
+
+        results = {}
+        execute_object_batch(objects, {'name'}, results)
+
+        self.assertEqual({0: {'id': '1', 'name': 'object 1'},
+                          1: {'id': '2', 'name': 'object 2'},
+                          2: {'id': '3', 'name': 'object 3'}}, results)
+        self.assertEqual([['1', '2', '3'], ['2']], [[call[0] for call in batch.calls] for batch in batches])
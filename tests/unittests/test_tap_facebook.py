@@ -1,14 +1,23 @@
+import copy
+import datetime
+import io
 import itertools
+import json
+import threading
+import time
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 import pendulum
+import singer
 import tap_facebook
 
 from tap_facebook import AdsInsights
+from facebook_business.api import Cursor
+import facebook_business.adobjects.ad as fb_ad
 from singer.catalog import Catalog, CatalogEntry
 from singer.schema import Schema
 from singer.utils import strftime, parse_args
-from singer import SingerDiscoveryError, SingerSyncError
+from singer import SingerConfigurationError, SingerDiscoveryError, SingerSyncError
 
 class TestAdsInsights(unittest.TestCase):
     fake_catalog_entry = CatalogEntry(schema={'properties': {'something': {'type': 'object'}}},
@@ -109,6 +118,635 @@ class TestGetStreamsToSync(unittest.TestCase):
         names_to_sync = [stream.name for stream in streams_to_sync]
         self.assertEqual(['adcreative'], names_to_sync)
 
+class TestObjectStreamFields(unittest.TestCase):
+
+    catalog_entry = CatalogEntry(metadata=[{'breadcrumb': ('properties', 'id'), 'metadata': {'inclusion': 'automatic'}},
+                                           {'breadcrumb': ('properties', 'name'), 'metadata': {'selected': True}},
+                                           {'breadcrumb': ('properties', 'ads'), 'metadata': {'selected': True}}])
+
+    def test_selected_fields_are_listed_from_the_edge(self):
+        """The listing edge returns every selected field, so no object is fetched again"""
+        mocked_ad = Mock()
+        mocked_ad.__getitem__ = Mock(return_value='2024-01-01T00:00:00+0000')
+        mocked_ad.export_all_data.return_value = {'id': '1', 'name': 'ad'}
+        mocked_account = Mock()
+        mocked_account.get_ads.return_value = [mocked_ad]
+
+        ads = tap_facebook.Ads('ads', mocked_account, 'ads', self.catalog_entry, {})
+        messages = list(ads)
+
+        self.assertEqual({'id', 'name', 'ads'}, set(mocked_account.get_ads.call_args.kwargs['fields']))
+        self.assertEqual({'id': '1', 'name': 'ad'}, messages[0]['record'])
+        mocked_ad.api_get.assert_not_called()
+
+    @patch('tap_facebook.metadata.to_map', wraps=tap_facebook.metadata.to_map)
+    def test_fields_are_computed_once_per_catalog_entry(self, mocked_to_map):
+        """Fields are frozensets walked from the metadata once, until the catalog entry changes"""
+        ads = tap_facebook.Ads('ads', None, 'ads', self.catalog_entry, {})
+
+        self.assertEqual(frozenset({'id', 'name', 'ads'}), ads.fields())
+        self.assertEqual(frozenset({'id'}), ads.automatic_fields())
+        ads.fields()
+        self.assertEqual(1, mocked_to_map.call_count)
+
+        ads.catalog_entry = CatalogEntry(metadata=[{'breadcrumb': ('properties', 'id'),
+                                                    'metadata': {'inclusion': 'automatic'}}])
+        self.assertEqual(frozenset({'id'}), ads.fields())
+        self.assertEqual(2, mocked_to_map.call_count)
+
+    def test_campaign_ads_are_not_listed_as_a_field(self):
+        """ads is not a campaign field, it must not be requested from the campaigns edge"""
+        campaigns = tap_facebook.Campaigns('campaigns', Mock(), 'campaigns', self.catalog_entry, {})
+
+        self.assertEqual({'id', 'name'}, set(campaigns.edge_fields()))
+
+    def test_campaign_ads_come_from_one_account_scan(self):
+        """The ads of every campaign are read from a single scan of the account's ads"""
+        def make_campaign(campaign_id):
+            campaign = Mock()
+            campaign.__getitem__ = Mock(return_value='2024-01-01T00:00:00+0000')
+            campaign.export_all_data.return_value = {'id': campaign_id}
+            return campaign
+
+        mocked_account = Mock()
+        mocked_account.get_campaigns.return_value = [make_campaign('1'), make_campaign('2'), make_campaign('3')]
+        mocked_account.get_ads.return_value = [{'id': '10', 'campaign_id': '1'},
+                                               {'id': '11', 'campaign_id': '1'},
+                                               {'id': '20', 'campaign_id': '2'}]
+
+        campaigns = tap_facebook.Campaigns('campaigns', mocked_account, 'campaigns', self.catalog_entry, {})
+        records = [message['record'] for message in campaigns if 'record' in message]
+
+        self.assertEqual([{'id': '1', 'ads': {'data': [{'id': '10'}, {'id': '11'}]}},
+                          {'id': '2', 'ads': {'data': [{'id': '20'}]}},
+                          {'id': '3', 'ads': {'data': []}}], records)
+        mocked_account.get_ads.assert_called_once()
+
+class TestIncrementalBookmark(unittest.TestCase):
+
+    def test_objects_are_filtered_on_epoch_seconds(self):
+        """Objects are compared to the bookmark across offsets without building pendulum dates"""
+        def make_ad(updated_time):
+            ad = Mock()
+            ad.__getitem__ = Mock(return_value=updated_time)
+            ad.export_all_data.return_value = {'updated_time': updated_time}
+            return ad
+
+        mocked_account = Mock()
+        mocked_account.get_ads.return_value = [make_ad('2024-01-01T01:00:00+0200'),
+                                               make_ad('2024-01-01T00:00:00-0100'),
+                                               make_ad('2024-01-01T00:30:00+0000')]
+        ads = tap_facebook.Ads('ads', mocked_account, 'ads', None,
+                               {'bookmarks': {'ads': {'updated_time': '2023-12-31T23:30:00+00:00'}}})
+
+        with patch('tap_facebook.pendulum.parse', wraps=tap_facebook.pendulum.parse) as mocked_parse:
+            messages = list(ads)
+
+        records = [message['record']['updated_time'] for message in messages if 'record' in message]
+        self.assertEqual(['2024-01-01T00:00:00-0100', '2024-01-01T00:30:00+0000'], records)
+        self.assertEqual('2024-01-01T00:00:00-01:00', messages[-1]['state']['bookmarks']['ads']['updated_time'])
+        self.assertLessEqual(mocked_parse.call_count, 2)
+
+    @patch.dict('tap_facebook.CONFIG', {}, clear=True)
+    def test_advancing_the_bookmark_logs_at_debug_level(self):
+        """Bookmarks advanced for every recordset do not add to the INFO logs"""
+        ads = tap_facebook.Ads('ads', None, 'ads', None,
+                               {'bookmarks': {'ads': {'updated_time': '2024-01-01T00:00:00+00:00'}}})
+
+        with self.assertLogs(tap_facebook.LOGGER, level='DEBUG') as logs:
+            tap_facebook.advance_bookmark(ads, 'updated_time', '2024-01-02T00:00:00+00:00')
+            tap_facebook.advance_bookmark(ads, 'updated_time', '2023-12-31T00:00:00+00:00')
+
+        self.assertEqual({'DEBUG'}, {record.levelname for record in logs.records})
+
+@patch.dict('tap_facebook.CONFIG', {'include_deleted': 'true'}, clear=True)
+class TestIncludeDeleted(unittest.TestCase):
+
+    def test_delivery_info_slices_are_merged(self):
+        """Every delivery_info slice is listed and the bookmark only advances once all of them are done"""
+        def get_ads(fields, params):
+            statuses = params['filtering'][0]['value']
+            ads = []
+            for status in statuses:
+                ad = Mock()
+                ad.__getitem__ = Mock(return_value='2024-01-0{}T00:00:00+0000'.format(len(status) % 9 + 1))
+                ad.export_all_data.return_value = {'id': status}
+                ads.append(ad)
+            return ads
+
+        mocked_account = Mock()
+        mocked_account.get_ads.side_effect = get_ads
+
+        ads = tap_facebook.Ads('ads', mocked_account, 'ads', None, {})
+        messages = list(ads)
+
+        self.assertEqual(5, mocked_account.get_ads.call_count)
+        self.assertEqual(14, len([message for message in messages if 'record' in message]))
+        self.assertEqual(['state'], list(messages[-1].keys()))
+        self.assertEqual(1, len([message for message in messages if 'state' in message]))
+
+    def test_slice_errors_are_raised(self):
+        """An error listing one of the slices fails the stream"""
+        def fail():
+            raise tap_facebook.TapFacebookException('slice failed')
+
+        with self.assertRaises(tap_facebook.TapFacebookException):
+            list(tap_facebook.iter_concurrently([lambda: [1, 2], fail], 2))
+
+@patch.dict('tap_facebook.CONFIG', {'adcreative_max_concurrent_batches': 3}, clear=True)
+class TestAdCreativePipeline(unittest.TestCase):
+
+    @patch('tap_facebook.BATCH_SIZE', 2)
+    @patch('tap_facebook.SCHEMAS.catalog_schema', return_value={'type': 'object', 'properties': {
+        'id': {'type': ['null', 'string']}}})
+    def test_batches_overlap_and_records_keep_listing_order(self, mocked_schema):
+        """The first batch only finishes after the last one, records are still written in listing order"""
+        last_batch_done = threading.Event()
+
+        def execute_object_batch(objects, fields, results):
+            if objects[0] == '0':
+                self.assertTrue(last_batch_done.wait(5))
+            if objects[0] == '4':
+                last_batch_done.set()
+            for index, obj in enumerate(objects):
+                results[index] = {'id': obj}
+
+        mocked_account = Mock()
+        mocked_account.get_ad_creatives.return_value = [str(index) for index in range(5)]
+        writer = Mock()
+        adcreative = tap_facebook.AdCreative('adcreative', mocked_account, 'adcreative', None)
+
+        with patch('tap_facebook.execute_object_batch', side_effect=execute_object_batch) as mocked_execute:
+            adcreative.sync(writer)
+
+        self.assertEqual(3, mocked_execute.call_count)
+        self.assertEqual(['0', '1', '2', '3', '4'], [call.args[1]['id'] for call in writer.write_record.call_args_list])
+
+@patch.dict('tap_facebook.CONFIG', {'adcreative_incremental': 'true', 'adcreative_full_refresh_days': 7}, clear=True)
+@patch('tap_facebook.AdCreative.sync_creatives')
+class TestAdCreativeIncremental(unittest.TestCase):
+
+    def make_ad(self, creative_id, updated_time):
+        return {'creative': {'id': creative_id}, 'updated_time': updated_time}
+
+    def test_first_sync_is_a_full_refresh(self, mocked_sync_creatives):
+        """Without a bookmark every creative is synced and the bookmarks start from the sync time"""
+        mocked_account = Mock(**{'get_ad_creatives.return_value': []})
+        adcreative = tap_facebook.AdCreative('adcreative', mocked_account, 'adcreative', None, state={})
+
+        adcreative.sync(Mock())
+
+        mocked_account.get_ad_creatives.assert_called_once()
+        mocked_account.get_ads.assert_not_called()
+        bookmark = adcreative.state['bookmarks']['adcreative']
+        self.assertEqual(bookmark['updated_time'], bookmark['last_full_refresh'])
+
+    def test_creatives_of_updated_ads_are_synced(self, mocked_sync_creatives):
+        """Only the creatives of the ads updated since the bookmark are synced"""
+        mocked_account = Mock()
+        mocked_account.get_ads.return_value = [self.make_ad('2', '2024-01-03T00:00:00+0000'),
+                                               self.make_ad('1', '2024-01-02T00:00:00+0000'),
+                                               self.make_ad('2', '2024-01-02T00:00:00+0000')]
+        last_full_refresh = pendulum.now('UTC').subtract(days=1).isoformat()
+        adcreative = tap_facebook.AdCreative('adcreative', mocked_account, 'adcreative', None, state={'bookmarks': {
+            'adcreative': {'updated_time': '2024-01-01T00:00:00+00:00', 'last_full_refresh': last_full_refresh}}})
+
+        adcreative.sync(Mock())
+
+        mocked_account.get_ad_creatives.assert_not_called()
+        self.assertEqual(pendulum.parse('2024-01-01T00:00:00+00:00').int_timestamp,
+                         mocked_account.get_ads.call_args.kwargs['params']['filtering'][0]['value'])
+        self.assertEqual(['1', '2'], [creative['id'] for creative in mocked_sync_creatives.call_args.args[0]])
+        self.assertEqual({'updated_time': '2024-01-03T00:00:00+00:00', 'last_full_refresh': last_full_refresh},
+                         adcreative.state['bookmarks']['adcreative'])
+
+    def test_full_refresh_after_configured_days(self, mocked_sync_creatives):
+        """Once `adcreative_full_refresh_days` passed every creative is synced again"""
+        mocked_account = Mock(**{'get_ad_creatives.return_value': []})
+        last_full_refresh = pendulum.now('UTC').subtract(days=8).isoformat()
+        adcreative = tap_facebook.AdCreative('adcreative', mocked_account, 'adcreative', None, state={'bookmarks': {
+            'adcreative': {'updated_time': '2024-01-01T00:00:00+00:00', 'last_full_refresh': last_full_refresh}}})
+
+        adcreative.sync(Mock())
+
+        mocked_account.get_ad_creatives.assert_called_once()
+        self.assertNotEqual(last_full_refresh, adcreative.state['bookmarks']['adcreative']['last_full_refresh'])
+
+@patch.dict('tap_facebook.CONFIG', {}, clear=True)
+class TestLeads(unittest.TestCase):
+
+    def make_ad(self, ad_id, lead_count):
+        ad = Mock()
+        ad.__getitem__ = Mock(return_value=str(ad_id))
+        ad.get_leads.return_value = ['{}-{}'.format(ad_id, index) for index in range(lead_count)]
+        return ad
+
+    def make_lead(self, lead_id, created_time):
+        lead = Mock()
+        lead.export_all_data.return_value = {'id': lead_id, 'created_time': created_time}
+        return lead
+
+    @patch('tap_facebook.LEADS_ADS_PER_CHUNK', 2)
+    def test_leads_of_ads_are_listed_concurrently(self):
+        """With `leads_max_concurrent_ads` the leads of every ad are listed, a chunk of ads at a time"""
+        tap_facebook.CONFIG['leads_max_concurrent_ads'] = 3
+        ads = [self.make_ad(ad_id, ad_id) for ad_id in range(5)]
+        leads = tap_facebook.Leads('leads', None, 'leads', None, {})
+
+        listed = list(leads.get_leads(iter(ads), pendulum.now('UTC'), 0))
+
+        self.assertEqual(sorted('{}-{}'.format(ad_id, index) for ad_id in range(5) for index in range(ad_id)),
+                         sorted(listed))
+        for ad in ads:
+            ad.get_leads.assert_called_once()
+
+    @patch('tap_facebook.SCHEMAS.catalog_schema', return_value={'type': 'object', 'properties': {
+        'id': {'type': ['null', 'string']}, 'created_time': {'type': ['null', 'string'], 'format': 'date-time'}}})
+    def test_leads_are_synced_from_the_edge_listing(self, mocked_schema):
+        """Leads are written as listed, with a state after the pages of ads that had leads"""
+        first_ad, empty_ad, last_ad = self.make_ad(1, 0), self.make_ad(2, 0), self.make_ad(3, 0)
+        first_ad.get_leads.return_value = [self.make_lead('a', '2024-01-02T00:00:00+0000')]
+        last_ad.get_leads.return_value = [self.make_lead('b', '2024-01-03T00:00:00+0000'),
+                                          self.make_lead('c', '2024-01-01T00:00:00+0000')]
+        writer = Mock()
+        states = []
+        writer.write_state.side_effect = lambda stream, state: states.append(copy.deepcopy(state))
+        leads = tap_facebook.Leads('leads', None, 'leads', None,
+                                   {'bookmarks': {'leads': {'created_time': '2023-12-01T00:00:00+00:00'}}})
+
+        with patch.object(tap_facebook.Leads, 'get_ad_pages',
+                          return_value=[([first_ad], 'page-2'), ([empty_ad], 'page-3'), ([last_ad], None)]):
+            leads.sync(writer)
+
+        self.assertEqual(['a', 'b', 'c'], [call.args[1]['id'] for call in writer.write_record.call_args_list])
+        self.assertEqual(['page-2', None], [state['bookmarks']['leads'].get('ads_after') for state in states])
+        self.assertEqual({'created_time': '2024-01-03T00:00:00+00:00'}, leads.state['bookmarks']['leads'])
+        first_ad.api_get.assert_not_called()
+
+    @patch('tap_facebook.LEADS_CHECKPOINT_ADS', 2)
+    @patch('tap_facebook.SCHEMAS.catalog_schema', return_value={'type': 'object', 'properties': {}})
+    def test_ads_without_leads_are_checkpointed_every_few_ads(self, mocked_schema):
+        """Pages of ads without leads only write a state every LEADS_CHECKPOINT_ADS ads"""
+        pages = [([self.make_ad(index, 0)], 'page-{}'.format(index + 1)) for index in range(5)]
+        writer = Mock()
+        leads = tap_facebook.Leads('leads', None, 'leads', None,
+                                   {'bookmarks': {'leads': {'created_time': '2023-12-01T00:00:00+00:00'}}})
+
+        with patch.object(tap_facebook.Leads, 'get_ad_pages', return_value=pages):
+            leads.sync(writer)
+
+        # After the second and fourth ads, and the final state
+        self.assertEqual(3, writer.write_state.call_count)
+
+    @patch('tap_facebook.SCHEMAS.catalog_schema', return_value={'type': 'object', 'properties': {}})
+    def test_stopped_sync_resumes_from_ads_cursor(self, mocked_schema):
+        """A sync that stopped mid-way keeps its time window and lists the ads from its paging cursor"""
+        next_ad = self.make_ad(2, 0)
+        mocked_account = Mock()
+        mocked_account.get_ads.return_value = [next_ad]
+        leads = tap_facebook.Leads('leads', mocked_account, 'leads', None, {'bookmarks': {'leads': {
+            'created_time': '2023-12-01T00:00:00+00:00', 'window_end': '2024-01-05T00:00:00+00:00',
+            'ads_after': 'page-2', 'latest_created_time': '2024-01-02T00:00:00+0000'}}})
+
+        leads.sync(Mock())
+
+        self.assertEqual('page-2', mocked_account.get_ads.call_args.kwargs['params']['after'])
+        window = next_ad.get_leads.call_args.kwargs['params']['filtering']
+        self.assertEqual(pendulum.parse('2024-01-05T00:00:00+00:00').int_timestamp, window[1]['value'])
+        self.assertEqual({'created_time': '2024-01-02T00:00:00+00:00'}, leads.state['bookmarks']['leads'])
+
+    def test_lead_gen_ads_only(self):
+        """With `leads_lead_gen_ads_only` only the ads of lead generation campaigns are listed"""
+        tap_facebook.CONFIG['leads_lead_gen_ads_only'] = 'true'
+        mocked_account = Mock()
+        mocked_account.get_ads.return_value = []
+        leads = tap_facebook.Leads('leads', mocked_account, 'leads', None, {})
+
+        list(leads.get_ad_pages())
+
+        self.assertEqual([{'field': 'campaign.objective', 'operator': 'IN', 'value': tap_facebook.LEAD_GEN_OBJECTIVES}],
+                         mocked_account.get_ads.call_args.kwargs['params']['filtering'])
+
+class TestMultipleAccounts(unittest.TestCase):
+
+    def test_account_ids(self):
+        """account_ids adds accounts after account_id, as a list or a comma separated string"""
+        self.assertEqual(['1'], tap_facebook.get_account_ids({'account_id': '1'}))
+        self.assertEqual(['1', '2', '3'], tap_facebook.get_account_ids({'account_id': '1', 'account_ids': '2, 3,1'}))
+        self.assertEqual(['1', '2'], tap_facebook.get_account_ids({'account_id': '1', 'account_ids': [2]}))
+
+    @patch.dict('tap_facebook.CONFIG', {'max_concurrent_accounts': 2}, clear=True)
+    @patch('singer.write_state')
+    @patch('tap_facebook.sync_account')
+    def test_state_is_namespaced_per_account(self, mocked_sync_account, mocked_write_state):
+        """Every account syncs from and writes to its own bookmarks of the emitted state"""
+        initial_states = {}
+        def sync_account(account, catalog, state, write_state, stop):
+            initial_states[account['account_id']] = state
+            write_state({'bookmarks': {'ads': {'updated_time': account['account_id']}}})
+            return False
+        mocked_sync_account.side_effect = sync_account
+
+        state = {'bookmarks': {'ads': {'updated_time': 'legacy'}},
+                 'accounts': {'2': {'bookmarks': {'ads': {'updated_time': 'previous'}}}}}
+        tap_facebook.do_sync_accounts([{'account_id': '1'}, {'account_id': '2'}, {'account_id': '3'}], None, state)
+
+        self.assertEqual({'1': {'bookmarks': {'ads': {'updated_time': 'legacy'}}},
+                          '2': {'bookmarks': {'ads': {'updated_time': 'previous'}}},
+                          '3': {}}, initial_states)
+        self.assertEqual({'accounts': {account_id: {'bookmarks': {'ads': {'updated_time': account_id}}}
+                                       for account_id in ['1', '2', '3']}},
+                         mocked_write_state.call_args_list[-1][0][0])
+
+    @patch.dict('tap_facebook.CONFIG', {'max_concurrent_accounts': 2}, clear=True)
+    @patch('tap_facebook.sync_account')
+    def test_failed_account_stops_the_others(self, mocked_sync_account):
+        """An account error is raised once the running accounts stopped, and no queued account starts"""
+        stopped = []
+        started = threading.Event()
+        def sync_account(account, catalog, state, write_state, stop):
+            if account['account_id'] == '1':
+                started.wait(5)
+                raise tap_facebook.TapFacebookException('account failed')
+            started.set()
+            self.assertTrue(stop.wait(5))
+            stopped.append(account['account_id'])
+        mocked_sync_account.side_effect = sync_account
+
+        with self.assertRaises(tap_facebook.TapFacebookException):
+            tap_facebook.do_sync_accounts([{'account_id': '1'}, {'account_id': '2'}, {'account_id': '3'}], None, {})
+
+        self.assertEqual(['2'], stopped)
+
+    @patch.dict('tap_facebook.CONFIG', {'max_concurrent_accounts': 2}, clear=True)
+    @patch('tap_facebook.sync_account')
+    def test_stopped_account_does_not_hide_the_error(self, mocked_sync_account):
+        """An account stopped by the failure of another one finishes first, the failure is still raised"""
+        started = threading.Event()
+        stopped = threading.Event()
+        def sync_account(account, catalog, state, write_state, stop):
+            if account['account_id'] == '1':
+                self.assertTrue(started.wait(5))
+                stop.set()
+                self.assertTrue(stopped.wait(5))
+                # Leaves the stopped account's future time to complete first
+                time.sleep(0.1)
+                raise tap_facebook.TapFacebookException('account failed')
+            started.set()
+            self.assertTrue(stop.wait(5))
+            stopped.set()
+            raise tap_facebook.ConsumerStopped()
+        mocked_sync_account.side_effect = sync_account
+
+        with self.assertRaisesRegex(tap_facebook.TapFacebookException, 'account failed'):
+            tap_facebook.do_sync_accounts([{'account_id': '1'}, {'account_id': '2'}], None, {})
+
+    @patch.dict('tap_facebook.CONFIG', {}, clear=True)
+    @patch('tap_facebook.sync_account', return_value=True)
+    def test_dma_error_is_raised_after_every_account(self, mocked_sync_account):
+        """The deprecated DMA stream fails the sync once every account is synced"""
+        with self.assertRaisesRegex(tap_facebook.TapFacebookException, 'ads_insights_dma'):
+            tap_facebook.do_sync_accounts([{'account_id': '1'}, {'account_id': '2'}], None, {})
+
+        self.assertEqual(2, mocked_sync_account.call_count)
+
+    def test_stopped_writer_writes_nothing(self):
+        """Once stopped, the writer drops what it buffered and stops the stream writing"""
+        stop = threading.Event()
+        writer = tap_facebook.MessageWriter(Mock(), stop)
+        stream = tap_facebook.Ads('ads', None, 'ads', None, {})
+        writer.write_record(stream, {'id': '1'})
+        writer.write_state(stream, {'bookmarks': {}})
+
+        stop.set()
+        with patch('sys.stdout') as mocked_stdout:
+            with self.assertRaises(tap_facebook.ConsumerStopped):
+                writer.write_record(stream, {'id': '2'})
+            with self.assertRaises(tap_facebook.ConsumerStopped):
+                writer.checkpoint()
+        mocked_stdout.write.assert_not_called()
+
+class TestGetAccounts(unittest.TestCase):
+
+    @patch('tap_facebook.fb_user.User')
+    @patch('tap_facebook.fb_adaccount.AdAccount')
+    def test_accounts_are_read_directly(self, mocked_ad_account, mocked_user):
+        """Each account is read from its act_<id> node without listing the user's accounts"""
+        mocked_ad_account.side_effect = lambda fbid: Mock(**{'api_get.return_value': {'account_id': fbid[4:]}})
+
+        accounts = tap_facebook.get_accounts(['1', '2'])
+
+        self.assertEqual([{'account_id': '1'}, {'account_id': '2'}], accounts)
+        mocked_user.assert_not_called()
+
+    @patch('tap_facebook.fb_user.User')
+    @patch('tap_facebook.fb_adaccount.AdAccount')
+    def test_unreadable_accounts_fall_back_to_the_listing(self, mocked_ad_account, mocked_user):
+        """Accounts that cannot be read directly are looked for in the user's accounts"""
+        mocked_ad_account.return_value.api_get.side_effect = tap_facebook.FacebookError('no permission')
+        mocked_user.return_value.get_ad_accounts.return_value = [{'account_id': '1'}]
+
+        self.assertEqual([{'account_id': '1'}], tap_facebook.get_accounts(['1']))
+
+    @patch('tap_facebook.fb_user.User')
+    @patch('tap_facebook.fb_adaccount.AdAccount')
+    def test_unreadable_account_fails_with_its_read_error(self, mocked_ad_account, mocked_user):
+        """An account the token cannot read fails with the error of reading it, not as not found"""
+        read_error = tap_facebook.FacebookError('no permission')
+        mocked_ad_account.return_value.api_get.side_effect = read_error
+        mocked_user.return_value.get_ad_accounts.return_value = [{'account_id': '1'}]
+
+        with self.assertRaisesRegex(SingerConfigurationError, 'no permission') as error:
+            tap_facebook.get_accounts(['2'])
+        self.assertIs(read_error, error.exception.__cause__)
+
+    @patch('tap_facebook.fb_user.User')
+    @patch('tap_facebook.fb_adaccount.AdAccount')
+    def test_unknown_account_is_not_found(self, mocked_ad_account, mocked_user):
+        """An account read under another id and missing from the listing is not found"""
+        mocked_ad_account.return_value.api_get.return_value = {'account_id': '1'}
+        mocked_user.return_value.get_ad_accounts.return_value = [{'account_id': '1'}]
+
+        with self.assertRaisesRegex(SingerConfigurationError, "Couldn't find account with id 2"):
+            tap_facebook.get_accounts(['2'])
+
+class TestConcurrentStreams(unittest.TestCase):
+
+    @patch('tap_facebook.sync_stream')
+    def test_messages_are_written_in_stream_order(self, mocked_sync_stream):
+        """Streams sync at once while each stream's state is written after its records, merged with the others"""
+        ads_started = threading.Event()
+        def sync_stream(stream, writer):
+            if stream.name == 'adsets':
+                self.assertTrue(ads_started.wait(5))
+            else:
+                ads_started.set()
+            writer.write_schema(stream, {})
+            writer.write_record(stream, {'id': stream.name})
+            stream.state = {'bookmarks': {stream.name: {'updated_time': '2024'}}}
+            writer.write_state(stream, stream.state)
+        mocked_sync_stream.side_effect = sync_stream
+
+        streams = [Mock(state={}, stop_events=()), Mock(state={}, stop_events=())]
+        streams[0].name = 'adsets'
+        streams[1].name = 'ads'
+        writer = Mock()
+        written_states = []
+        writer.write_state.side_effect = lambda stream, state: written_states.append(copy.deepcopy(state))
+
+        tap_facebook.sync_streams_concurrently(streams, {'bookmarks': {'campaigns': {}}}, writer, 2)
+
+        for stream in streams:
+            calls = [call for call in writer.method_calls if call[1][0] is stream]
+            self.assertEqual(['write_schema', 'write_record', 'write_state'], [call[0] for call in calls])
+        self.assertEqual({'bookmarks': {'campaigns': {},
+                                        'ads': {'updated_time': '2024'},
+                                        'adsets': {'updated_time': '2024'}}}, written_states[-1])
+        self.assertEqual(2, len(written_states[0]['bookmarks']))
+
+    @patch('tap_facebook.sync_stream')
+    def test_failed_stream_stops_the_others(self, mocked_sync_stream):
+        """A stream error is raised while the other streams are told to stop"""
+        def sync_stream(stream, writer):
+            if stream.name == 'adsets':
+                raise tap_facebook.TapFacebookException('stream failed')
+            while not stream.stopped():
+                time.sleep(0.01)
+        mocked_sync_stream.side_effect = sync_stream
+        streams = [tap_facebook.AdSets('adsets', None, 'adsets', None, {}),
+                   tap_facebook.Ads('ads', None, 'ads', None, {})]
+
+        with self.assertRaisesRegex(tap_facebook.TapFacebookException, 'stream failed'):
+            tap_facebook.sync_streams_concurrently(streams, {}, Mock(), 2)
+
+        self.assertTrue(streams[1].stopped())
+
+    @patch('time.sleep')
+    @patch('tap_facebook.API')
+    def test_adcreative_syncs_concurrently(self, mocked_api, mocked_sleep):
+        """AdCreative writes its batched records through the writer of a background stream, batches pipelined or not"""
+        def execute():
+            for success in successes:
+                success(Mock(**{'json.return_value': {'id': '1'}}))
+            successes.clear()
+        mocked_api.new_batch.side_effect = lambda: Mock(**{'execute.side_effect': execute})
+        catalog_entry = CatalogEntry(schema=Schema.from_dict({'type': 'object', 'properties': {'id': {'type': 'string'}}}),
+                                     metadata=[])
+
+        for max_batches in ['1', '2']:
+            with self.subTest(max_batches=max_batches), \
+                 patch.dict('tap_facebook.CONFIG', {'adcreative_max_concurrent_batches': max_batches}, clear=True):
+                successes = []
+                creative = Mock()
+                creative.api_get.side_effect = lambda fields, batch, success, failure: successes.append(success)
+                mocked_account = Mock(**{'get_ad_creatives.return_value': [creative]})
+                streams = [tap_facebook.AdCreative('adcreative', mocked_account, 'adcreative', catalog_entry),
+                           tap_facebook.Ads('ads', Mock(**{'get_ads.return_value': []}), 'ads', catalog_entry, {})]
+                writer = Mock()
+
+                tap_facebook.sync_streams_concurrently(streams, {}, writer, 2)
+
+                records = [call.args[1] for call in writer.write_record.call_args_list if call.args[0] is streams[0]]
+                self.assertEqual([{'id': '1'}], records)
+                mocked_sleep.assert_not_called()
+
+    def test_streams_advance_their_own_copy_of_an_empty_state(self):
+        """Streams do not share the empty state they start from"""
+        state = {}
+        streams = [tap_facebook.AdSets('adsets', None, 'adsets', None, state),
+                   tap_facebook.Ads('ads', None, 'ads', None, state)]
+
+        with patch('tap_facebook.sync_stream'):
+            tap_facebook.sync_streams_concurrently(streams, state, Mock(), 2)
+
+        self.assertIsNot(state, streams[0].state)
+        self.assertIsNot(streams[0].state, streams[1].state)
+
+class TestMessageWriter(unittest.TestCase):
+
+    stream = tap_facebook.Ads('ads', None, 'ads_alias', None, {})
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_records_match_singer_output(self, mocked_stdout):
+        """Records are written exactly as singer writes them"""
+        time_extracted = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        record = {'id': '1', 'name': 'h\u00e9', 'spend': 1.5}
+        writer = tap_facebook.MessageWriter()
+        writer.write_record(self.stream, record, time_extracted)
+        writer.flush()
+
+        expected = singer.format_message(singer.RecordMessage(stream='ads_alias', record=record,
+                                                              time_extracted=time_extracted))
+        self.assertEqual(expected + '\n', mocked_stdout.getvalue())
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_records_are_flushed_before_state(self, mocked_stdout):
+        """Records stay buffered until a STATE message, which is written after them"""
+        writer = tap_facebook.MessageWriter(write_state=lambda state: mocked_stdout.write('STATE\n'))
+        writer.write_record(self.stream, {'id': '1'})
+        writer.write_record(self.stream, {'id': '2'})
+        self.assertEqual('', mocked_stdout.getvalue())
+
+        writer.write_state(self.stream, {})
+
+        self.assertEqual(['RECORD', 'RECORD', 'STATE'],
+                         [json.loads(line)['type'] if line.startswith('{') else line
+                          for line in mocked_stdout.getvalue().splitlines()])
+
+    @patch('tap_facebook.OUTPUT_BUFFER_SIZE', 10)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_full_buffer_is_flushed(self, mocked_stdout):
+        """Records are written once the buffer is full"""
+        writer = tap_facebook.MessageWriter()
+        writer.write_record(self.stream, {'id': '1'})
+
+        self.assertEqual(1, len(mocked_stdout.getvalue().splitlines()))
+
+    @patch.dict('tap_facebook.CONFIG', {'state_checkpoint_records': 2}, clear=True)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_states_are_coalesced(self, mocked_stdout):
+        """With state_checkpoint_records only the latest state is written once enough records went by"""
+        written_states = []
+        writer = tap_facebook.MessageWriter(write_state=written_states.append)
+
+        writer.write_record(self.stream, {'id': '1'})
+        writer.write_state(self.stream, 1)
+        writer.write_record(self.stream, {'id': '2'})
+        writer.write_state(self.stream, 2)
+        writer.write_record(self.stream, {'id': '3'})
+        writer.write_state(self.stream, 3)
+        self.assertEqual([2], written_states)
+        self.assertEqual(2, len(mocked_stdout.getvalue().splitlines()))
+
+        writer.checkpoint()
+        self.assertEqual([2, 3], written_states)
+        self.assertEqual(3, len(mocked_stdout.getvalue().splitlines()))
+
+class TestSchemaRegistry(unittest.TestCase):
+
+    @patch('tap_facebook.load_shared_schema_refs', wraps=tap_facebook.load_shared_schema_refs)
+    def test_schemas_are_resolved_once(self, mocked_load_refs):
+        """Shared schemas are loaded once and every resolved schema is reused"""
+        registry = tap_facebook.SchemaRegistry()
+
+        adcreative = tap_facebook.AdCreative('adcreative', None, 'adcreative', None)
+        schema = registry.schema(adcreative)
+
+        self.assertIs(schema, registry.schema(adcreative))
+        self.assertNotIn('$ref', str(schema))
+        registry.schema(tap_facebook.Ads('ads', None, 'ads', None, {}))
+        mocked_load_refs.assert_called_once()
+
+    def test_metadata_map_is_kept_per_catalog_entry(self):
+        """Every catalog entry has its own metadata map"""
+        registry = tap_facebook.SchemaRegistry()
+        selected = CatalogEntry(metadata=[{'breadcrumb': (), 'metadata': {'selected': True}}])
+        other = CatalogEntry(metadata=[])
+
+        self.assertEqual({(): {'selected': True}}, registry.metadata_map(selected))
+        self.assertIs(registry.metadata_map(selected), registry.metadata_map(selected))
+        self.assertEqual({}, registry.metadata_map(other))
+
 class TestDateTimeParsing(unittest.TestCase):
 
     def test(self):
@@ -118,6 +756,113 @@ class TestDateTimeParsing(unittest.TestCase):
             tap_facebook.transform_datetime_string(dt),
             expected)
 
+    @patch('tap_facebook.dateutil.parser.parse')
+    def test_graph_formats_do_not_use_dateutil(self, mocked_parse):
+        """The Graph API formats are parsed without dateutil"""
+        self.assertEqual('2024-01-02T00:00:00.000000Z', tap_facebook.transform_datetime_string('2024-01-02'))
+        self.assertEqual('2024-01-02T00:34:05.500000Z',
+                         tap_facebook.transform_datetime_string('2024-01-02T03:04:05.5+02:30'))
+        mocked_parse.assert_not_called()
+
+    def test_other_formats_fall_back_to_dateutil(self):
+        """Other formats are still parsed by dateutil"""
+        self.assertEqual('2024-01-02T03:04:05.000000Z', tap_facebook.transform_datetime_string('Jan 2 2024 03:04:05'))
+        self.assertIsNone(tap_facebook.parse_graph_datetime('2024-02-30'))
+
+@patch.dict('tap_facebook.CONFIG', {'auto_tune_page_size': 'true'}, clear=True)
+class TestPageSize(unittest.TestCase):
+
+    def reduce_data_error(self):
+        return tap_facebook.FacebookRequestError(
+            'reduce', {}, 500, {}, json.dumps({'error': {'code': 1, 'message':
+                "Please reduce the amount of data you're asking for, then retry your request"}}))
+
+    def test_configured_page_size_per_stream(self):
+        """`page_sizes` overrides `result_return_limit` for the streams it names"""
+        tap_facebook.CONFIG['page_sizes'] = '{"ads": 500}'
+
+        self.assertEqual(500, tap_facebook.Ads('ads', None, 'ads', None, {}).page_size().limit)
+        self.assertEqual(tap_facebook.RESULT_RETURN_LIMIT,
+                         tap_facebook.AdSets('adsets', None, 'adsets', None, {}).page_size().limit)
+
+    def test_page_size_shrinks_on_reduce_data_errors(self):
+        """A page Facebook asks to reduce is requested again with half the limit"""
+        page_size = tap_facebook.PageSize(400, auto_tune=True)
+        request = Mock(side_effect=[self.reduce_data_error(), ['ad']])
+
+        self.assertEqual(['ad'], list(tap_facebook.iter_pages(request, {'filtering': []}, page_size)))
+        self.assertEqual([400, 200], [call.kwargs['params']['limit'] for call in request.call_args_list])
+        self.assertLess(page_size.limit, 400)
+
+    def test_adcreative_first_page_shrinks_on_reduce_data_errors(self):
+        """The first page of the creatives is requested again with a smaller limit"""
+        mocked_account = Mock()
+        mocked_account.get_ad_creatives.side_effect = [self.reduce_data_error(), ['creative']]
+        adcreative = tap_facebook.AdCreative('adcreative', mocked_account, 'adcreative', None)
+
+        self.assertEqual(['creative'], list(adcreative.list_adcreatives()))
+        self.assertEqual([tap_facebook.RESULT_RETURN_LIMIT, tap_facebook.RESULT_RETURN_LIMIT // 2],
+                         [call.kwargs['params']['limit'] for call in mocked_account.get_ad_creatives.call_args_list])
+
+    @patch('time.sleep')
+    def test_first_page_timeout_shrinks_before_retrying(self, mocked_sleep):
+        """A first page that times out is requested again with a smaller limit instead of being retried"""
+        mocked_account = Mock()
+        mocked_account.get_ads.side_effect = [tap_facebook.Timeout(), ['ad']]
+        ads = tap_facebook.Ads('ads', mocked_account, 'ads', None, {})
+
+        self.assertEqual(['ad'], list(tap_facebook.iter_pages(ads._call_get_ads, {}, ads.page_size())))
+        self.assertEqual([tap_facebook.RESULT_RETURN_LIMIT, tap_facebook.RESULT_RETURN_LIMIT // 2],
+                         [call.kwargs['params']['limit'] for call in mocked_account.get_ads.call_args_list])
+        mocked_sleep.assert_not_called()
+
+    @patch('time.sleep')
+    def test_smallest_first_page_is_retried(self, mocked_sleep):
+        """A first page that cannot get any smaller is retried at the same limit"""
+        mocked_account = Mock()
+        mocked_account.get_ads.side_effect = [tap_facebook.Timeout(), ['ad']]
+        ads = tap_facebook.Ads('ads', mocked_account, 'ads', None, {})
+
+        page_size = tap_facebook.PageSize(tap_facebook.MIN_PAGE_SIZE, auto_tune=True)
+        self.assertEqual(['ad'], list(tap_facebook.iter_pages(ads._call_get_ads, {}, page_size)))
+        self.assertEqual(1, mocked_sleep.call_count)
+
+    def test_page_size_grows_on_fast_pages_up_to_failing_size(self):
+        """Fast pages double the limit, never back to a size that failed"""
+        page_size = tap_facebook.PageSize(400, auto_tune=True)
+        page_size.succeeded(1)
+        self.assertEqual(800, page_size.limit)
+
+        page_size.failed(self.reduce_data_error())
+        page_size.succeeded(1)
+        self.assertEqual(799, page_size.limit)
+
+    def test_pages_come_with_the_cursor_of_the_next_page(self):
+        """Every page is listed with the paging cursor the listing resumes from after it"""
+        responses = iter([{'data': [{'id': '1'}, {'id': '2'}], 'paging': {'cursors': {'after': 'A'}, 'next': 'url'}},
+                          {'data': [{'id': '3'}], 'paging': {'cursors': {'after': 'B'}}}])
+        api = Mock()
+        api.call.side_effect = lambda *args, **kwargs: Mock(**{'json.return_value': next(responses),
+                                                                'headers.return_value': {}})
+
+        def request(params):
+            cursor = Cursor(target_objects_class=fb_ad.Ad, api=api, node_id='act_1', endpoint='ads', params=params)
+            cursor.load_next_page()
+            return cursor
+
+        pages = list(tap_facebook.iter_page_lists(request, {}, tap_facebook.PageSize(2)))
+
+        self.assertEqual([(['1', '2'], 'A'), (['3'], None)], [([ad['id'] for ad in ads], after) for ads, after in pages])
+        self.assertEqual('A', api.call.call_args.kwargs['params']['after'])
+
+    def test_errors_are_raised_without_auto_tuning(self):
+        """Without `auto_tune_page_size` the error is raised as before"""
+        page_size = tap_facebook.PageSize(400)
+        request = Mock(side_effect=self.reduce_data_error())
+
+        with self.assertRaises(tap_facebook.FacebookRequestError):
+            list(tap_facebook.iter_pages(request, {}, page_size))
+
 
 def fake_args(is_discovery):
     from collections import namedtuple